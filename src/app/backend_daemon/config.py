@@ -4,8 +4,6 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
-Aspect = Literal["4:3", "16:9", "unknown"]
-
 
 class FileScanInput(BaseModel):
     path: str
@@ -19,6 +17,9 @@ class ThumbConfig(BaseModel):
     height_4_3: int = 240
     height_16_9: int = 180
     render_dpi: int = 144
+    # webp is several times smaller and faster to encode; jpg stays the default
+    # so existing thumbnail caches remain valid.
+    format: Literal["jpg", "webp"] = "jpg"
 
 
 class EmbedConfig(BaseModel):
@@ -28,6 +29,7 @@ class EmbedConfig(BaseModel):
     model_image: str = "image-embedding-1"
     max_concurrency: int = 2
     batch_size: int = 64
+    max_batch_tokens: int = 300000
     req_per_min: int = 120
     tok_per_min: int = 200000
     max_retries: int = 8
@@ -4,14 +4,14 @@ import asyncio
 import importlib
 import importlib.util
 import struct
-from typing import List
+from typing import Any, List, Tuple
 
 if importlib.util.find_spec("openai") is None:
-    class OpenAI:  # type: ignore[override]
+    class AsyncOpenAI:  # type: ignore[override]
         def __init__(self, *_args: object, **_kwargs: object) -> None:
             raise ModuleNotFoundError("openai is required for embeddings")
 else:
-    OpenAI = importlib.import_module("openai").OpenAI
+    AsyncOpenAI = importlib.import_module("openai").AsyncOpenAI
 
 from app.backend_daemon.rate_limit import DualTokenBucket, backoff_delay
 
@@ -28,13 +28,42 @@ def zero_vector(dim: int) -> bytes:
     return pack_f32([0.0] * dim)
 
 
+def pack_text_batches(texts: List[str], max_items: int, max_tokens: int) -> List[Tuple[int, int]]:
+    """Greedily group texts into [start, end) ranges bounded by item and token counts.
+
+    A single text above ``max_tokens`` still gets a batch of its own.
+    """
+    max_items = max(1, max_items)
+    batches: List[Tuple[int, int]] = []
+    start = 0
+    tokens = 0
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text)
+        if i > start and (i - start >= max_items or tokens + cost > max_tokens):
+            batches.append((start, i))
+            start = i
+            tokens = 0
+        tokens += cost
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
+
+
+def new_embedding_client() -> Any:
+    """Create one AsyncOpenAI client to share across a stage's batches; close it when done."""
+    return AsyncOpenAI()
+
+
 async def embed_text_batch_openai(
     texts: List[str],
     model: str,
     limiter: DualTokenBucket,
     max_retries: int,
+    client: Any = None,
 ) -> List[List[float]]:
-    client = OpenAI()
+    if client is None:
+        async with AsyncOpenAI() as owned:
+            return await embed_text_batch_openai(texts, model, limiter, max_retries, owned)
 
     tok_cost = sum(estimate_tokens(t) for t in texts)
     await limiter.acquire(req_cost=1.0, tok_cost=float(tok_cost))
@@ -42,8 +71,16 @@ async def embed_text_batch_openai(
     attempt = 0
     while True:
         try:
-            resp = client.embeddings.create(model=model, input=texts)
-            return [d.embedding for d in resp.data]
+            resp = await client.embeddings.create(model=model, input=texts)
+            data = resp.data
+            if len(data) != len(texts):
+                raise RuntimeError(
+                    f"embedding count mismatch: expected {len(texts)}, got {len(data)}"
+                )
+            out: List[List[float]] = [[] for _ in texts]
+            for item in data:
+                out[item.index] = item.embedding
+            return out
         except Exception as exc:
             if attempt >= max_retries:
                 raise
@@ -1,23 +1,32 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
 import math
 import os
+import shutil
 import sqlite3
+import tempfile
 import time
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from PIL import Image
 
 from app.backend_daemon.bm25 import upsert_fts_page
 from app.backend_daemon.config import JobOptions
 from app.backend_daemon.db import now_epoch
 from app.backend_daemon.embedder import (
     embed_text_batch_openai,
+    new_embedding_client,
     pack_f32,
+    pack_text_batches,
     zero_vector,
 )
 from app.backend_daemon.enums import (
@@ -29,16 +38,40 @@ from app.backend_daemon.enums import (
 )
 from app.backend_daemon.event_bus import EventBus
 from app.backend_daemon.pdf_convert import convert_pptx_to_pdf_libreoffice
-from app.backend_daemon.pptx_meta import detect_aspect_from_pptx
+from app.backend_daemon.pptx_meta import count_slides_in_zip, detect_aspect_from_zip
 from app.backend_daemon.rate_limit import DualTokenBucket
 from app.backend_daemon.text_extract import extract_page_text, fast_text_sig
-from app.backend_daemon.thumb_render import render_pdf_page_to_thumb, thumb_size
+from app.backend_daemon.thumb_render import open_pdf, render_pdf_page_to_thumb, thumb_size
 from app.backend_daemon.utils_win import is_windows, which_soffice_windows
 from app.backend_daemon.planner import FileScan, scan_specific_files
 
 logger = logging.getLogger(__name__)
 
 
+def _usable_cpus() -> int:
+    """CPUs this process may run on; honours affinity masks and container cpusets."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _load_image_input(
+    image_path: str, width: int, height: int, channels_first: bool
+) -> Any:
+    """Decode and resize a thumbnail into a (1, ...) float32 model input."""
+    with Image.open(image_path) as src:
+        # JPEG thumbnails can decode straight at a reduced scale when they are
+        # at least twice the model input; other formats ignore the hint.
+        src.draft("RGB", (width, height))
+        img = src.convert("RGB")
+    if img.size != (width, height):
+        img = img.resize((width, height), Image.BICUBIC)
+    arr = np.asarray(img, dtype=np.float32) / 255.0
+    if channels_first:
+        arr = np.transpose(arr, (2, 0, 1))
+    return np.expand_dims(arr, axis=0).astype(np.float32)
+
+
 @dataclass
 class CancelToken:
     flag: asyncio.Event
@@ -87,6 +120,7 @@ class JobManager:
         self._image_embedder = None
         self._image_embedder_info: dict[str, object] | None = None
         self._image_embedder_path: Path | None = None
+        self._image_embedder_sig: tuple[int, int] | None = None
 
     async def start_watchdog(self) -> None:
         if self._watchdog_task is None:
@@ -344,12 +378,12 @@ class JobManager:
             total_entries = len(options.file_scans)
             for idx, entry in enumerate(options.file_scans, start=1):
                 try:
-                    raw_path = getattr(entry, "path", None) or ""
+                    raw_path = entry.path or ""
                     if not raw_path:
                         record_skip("missing_path", raw_path)
                         continue
                     p = Path(raw_path)
-                    if p.suffix.lower() not in (".pptx",):
+                    if p.suffix.lower() != ".pptx":
                         logger.warning(
                             "[INDEX_PLAN] skip_non_pptx current=%d total=%d path=%s",
                             idx,
@@ -416,21 +450,22 @@ class JobManager:
                 )
                 raise ValueError("missing_frontend_scan_inputs")
 
-        def slide_count_fast(pptx: str) -> int:
-            import zipfile
-
-            with zipfile.ZipFile(pptx) as zf:
-                return sum(
-                    1
-                    for n in zf.namelist()
-                    if n.startswith("ppt/slides/slide") and n.endswith(".xml")
-                )
-
         needs_text_task = False
         needs_text_vec_task = False
         needs_thumb_task = False
         needs_img_vec_task = False
 
+        plan_text = options.enable_text
+        plan_thumb = options.enable_thumb and options.thumb.enabled and options.pdf.enabled
+        plan_bm25 = options.enable_bm25
+        plan_text_vec = options.enable_text_vec and options.embed.enabled_text
+        plan_img_vec = (
+            options.enable_img_vec and options.embed.enabled_image and options.thumb.enabled
+        )
+        text_params = params_for_text(options)
+        bm25_params = params_for_bm25(options)
+        text_vec_params = params_for_text_vec(options)
+
         for fs in scans:
             await pause.wait_if_paused()
             await cancel.check()
@@ -444,7 +479,9 @@ class JobManager:
             file_id = self._upsert_file(fs.path, fs.size_bytes, fs.mtime_epoch, aspect)
 
             try:
-                if not zipfile.is_zipfile(fs.path):
+                try:
+                    zf = zipfile.ZipFile(fs.path)
+                except (zipfile.BadZipFile, OSError):
                     msg = "File is not a zip file"
                     logger.error("slide_count failed: %s", msg)
                     self.conn.execute(
@@ -454,14 +491,14 @@ class JobManager:
                     self.conn.commit()
                     continue
 
-                aspect = detect_aspect_from_pptx(fs.path)
-                self.conn.execute(
-                    "UPDATE files SET slide_aspect=? WHERE file_id=?",
-                    (aspect, file_id),
-                )
-
                 try:
-                    sc = slide_count_fast(fs.path)
+                    with zf:
+                        aspect = detect_aspect_from_zip(zf)
+                        self.conn.execute(
+                            "UPDATE files SET slide_aspect=? WHERE file_id=?",
+                            (aspect, file_id),
+                        )
+                        sc = count_slides_in_zip(zf)
                     self.conn.execute(
                         "UPDATE files SET slide_count=? WHERE file_id=?",
                         (sc, file_id),
@@ -491,78 +528,64 @@ class JobManager:
                         or int(prev["mtime_epoch"]) != fs.mtime_epoch
                     )
 
+                thumb_params = params_for_thumb(options, aspect)
+                img_vec_params = params_for_img_vec(options, aspect)
+
                 for page_id in page_ids:
                     status_map = self._artifact_status_map(page_id)
-                    text_params = params_for_text(options)
-                    thumb_params = params_for_thumb(options, aspect)
-                    bm25_params = params_for_bm25(options)
-                    text_vec_params = params_for_text_vec(options)
-                    img_vec_params = params_for_img_vec(options, aspect)
 
-                    text_needed = self._artifact_needs_refresh(
+                    if plan_text and self._artifact_needs_refresh(
                         status_map.get(str(ArtifactKind.TEXT), {}).get("status"),
                         changed,
                         status_map.get(str(ArtifactKind.TEXT), {}).get("params"),
                         text_params,
                         force_refresh=True,
-                    )
-                    thumb_needed = self._artifact_needs_refresh(
+                    ):
+                        self._artifact_set(
+                            job_id,
+                            page_id,
+                            ArtifactKind.TEXT,
+                            ArtifactStatus.QUEUED,
+                            options=text_params,
+                        )
+                        needs_text_task = True
+                    if plan_thumb and self._artifact_needs_refresh(
                         status_map.get(str(ArtifactKind.THUMB), {}).get("status"),
                         changed,
                         status_map.get(str(ArtifactKind.THUMB), {}).get("params"),
                         thumb_params,
                         force_refresh=True,
-                    )
-                    bm25_needed = self._artifact_needs_refresh(
+                    ):
+                        self._artifact_set(
+                            job_id,
+                            page_id,
+                            ArtifactKind.THUMB,
+                            ArtifactStatus.QUEUED,
+                            options=thumb_params,
+                        )
+                        needs_thumb_task = True
+                    if plan_bm25 and self._artifact_needs_refresh(
                         status_map.get(str(ArtifactKind.BM25), {}).get("status"),
                         changed,
                         status_map.get(str(ArtifactKind.BM25), {}).get("params"),
                         bm25_params,
                         force_refresh=True,
-                    )
-                    text_vec_needed = self._artifact_needs_refresh(
-                        status_map.get(str(ArtifactKind.TEXT_VEC), {}).get("status"),
-                        changed,
-                        status_map.get(str(ArtifactKind.TEXT_VEC), {}).get("params"),
-                        text_vec_params,
-                        force_refresh=True,
-                    )
-                    img_vec_needed = self._artifact_needs_refresh(
-                        status_map.get(str(ArtifactKind.IMG_VEC), {}).get("status"),
-                        changed,
-                        status_map.get(str(ArtifactKind.IMG_VEC), {}).get("params"),
-                        img_vec_params,
-                        force_refresh=True,
-                    )
-
-                    if options.enable_text and text_needed:
+                    ):
                         self._artifact_set(
                             job_id,
-                            page_id,
-                            ArtifactKind.TEXT,
-                            ArtifactStatus.QUEUED,
-                            options=text_params,
-                        )
-                        needs_text_task = True
-                    if options.enable_thumb and options.thumb.enabled and options.pdf.enabled:
-                        if thumb_needed:
-                            self._artifact_set(
-                                job_id,
-                                page_id,
-                                ArtifactKind.THUMB,
-                                ArtifactStatus.QUEUED,
-                                options=thumb_params,
-                            )
-                            needs_thumb_task = True
-                    if options.enable_bm25 and bm25_needed:
-                        self._artifact_mark(
                             page_id,
                             ArtifactKind.BM25,
                             ArtifactStatus.QUEUED,
                             options=bm25_params,
                         )
                         needs_text_task = True
-                    if options.enable_text_vec and options.embed.enabled_text and text_vec_needed:
+                    if plan_text_vec and self._artifact_needs_refresh(
+                        status_map.get(str(ArtifactKind.TEXT_VEC), {}).get("status"),
+                        changed,
+                        status_map.get(str(ArtifactKind.TEXT_VEC), {}).get("params"),
+                        text_vec_params,
+                        force_refresh=True,
+                    ):
                         self._artifact_set(
                             job_id,
                             page_id,
@@ -571,11 +594,12 @@ class JobManager:
                             options=text_vec_params,
                         )
                         needs_text_vec_task = True
-                    if (
-                        options.enable_img_vec
-                        and options.embed.enabled_image
-                        and options.thumb.enabled
-                        and img_vec_needed
+                    if plan_img_vec and self._artifact_needs_refresh(
+                        status_map.get(str(ArtifactKind.IMG_VEC), {}).get("status"),
+                        changed,
+                        status_map.get(str(ArtifactKind.IMG_VEC), {}).get("params"),
+                        img_vec_params,
+                        force_refresh=True,
                     ):
                         self._artifact_set(
                             job_id,
@@ -758,15 +782,6 @@ class JobManager:
             (status, now, json.dumps(options, ensure_ascii=False), page_id, str(kind)),
         )
 
-    def _artifact_mark(
-        self, page_id: int, kind: ArtifactKind, status: ArtifactStatus, options: dict
-    ) -> None:
-        now = now_epoch()
-        self.conn.execute(
-            "UPDATE artifacts SET status=?, updated_at=?, params_json=? WHERE page_id=? AND kind=?",
-            (status, now, json.dumps(options, ensure_ascii=False), page_id, str(kind)),
-        )
-
     def _enqueue_file_task_pdf(self, job_id: str, file_id: int, path: str, priority: int) -> None:
         self.conn.execute(
             "INSERT INTO tasks(job_id,file_id,kind,status,priority) VALUES (?,?,?,?,?)",
@@ -1092,46 +1107,56 @@ class JobManager:
 
         pdf_dir = root / ".slidemanager" / "pdf"
         pdf_dir.mkdir(parents=True, exist_ok=True)
+        # One LibreOffice profile per job: the first launch initialises it and
+        # later conversions in this job start from the warm profile.
+        lo_profile = Path(tempfile.mkdtemp(prefix="lo_profile_"))
 
         self._task_start(task_id)
         processed_pages = 0
-        for fr in file_rows:
-            await pause.wait_if_paused()
-            await cancel.check()
-            file_id = int(fr["file_id"])
-            pptx_path = Path(str(fr["path"]))
-            aspect = str(fr["slide_aspect"] or "unknown")
-            out_pdf = pdf_dir / f"{file_id}.pdf"
+        # The next deck converts in the background while this one renders; only
+        # one conversion is ever in flight, so the shared profile stays safe.
+        inflight: List["asyncio.Future[None]"] = []
 
-            try:
-                await asyncio.to_thread(
-                    convert_pptx_to_pdf_libreoffice,
-                    pptx_path,
-                    out_pdf,
-                    soffice,
-                    options.pdf.timeout_sec,
-                )
-            except Exception as exc:
-                logger.exception("pdf convert failed: %s", exc)
-                now = now_epoch()
-                page_rows = self.conn.execute(
-                    "SELECT page_id FROM pages WHERE file_id=?",
-                    (file_id,),
-                ).fetchall()
-                for pr in page_rows:
-                    pid = int(pr["page_id"])
-                    self.conn.execute(
-                        "UPDATE artifacts SET status=?, updated_at=?, error_code=?, error_message=? WHERE page_id=? AND kind=?",
-                        (
-                            ArtifactStatus.ERROR,
-                            now,
-                            "PDF_CONVERT_FAIL",
-                            str(exc)[:500],
-                            pid,
-                            ArtifactKind.THUMB,
-                        ),
-                    )
-                    if options.enable_img_vec and options.embed.enabled_image:
+        def prepare(fr: sqlite3.Row) -> Tuple[Any, ...]:
+            prepared = self._prepare_thumb_file(
+                fr, root, pdf_dir, options, soffice, lo_profile
+            )
+            if prepared[-1] is not None:
+                inflight.append(prepared[-1])
+            return prepared
+
+        try:
+            prepared = prepare(file_rows[0])
+            for idx, fr in enumerate(file_rows):
+                await pause.wait_if_paused()
+                await cancel.check()
+                file_id, pptx_path, out_pdf, targets, fresh, sig_path, deck_sig, converting = prepared
+
+                convert_error: Optional[Exception] = None
+                if converting is not None:
+                    try:
+                        await converting
+                        if deck_sig:
+                            self._write_deck_signature(out_pdf.with_suffix(".sig"), deck_sig)
+                    except Exception as exc:
+                        convert_error = exc
+                        # A timed-out or crashed soffice can leave the profile locked
+                        # or half-written; start the next deck from a clean one.
+                        shutil.rmtree(lo_profile, ignore_errors=True)
+                        lo_profile = Path(tempfile.mkdtemp(prefix="lo_profile_"))
+                if idx + 1 < len(file_rows):
+                    prepared = prepare(file_rows[idx + 1])
+
+                if convert_error is not None:
+                    exc = convert_error
+                    logger.error("pdf convert failed: %s", exc, exc_info=exc)
+                    now = now_epoch()
+                    page_rows = self.conn.execute(
+                        "SELECT page_id FROM pages WHERE file_id=?",
+                        (file_id,),
+                    ).fetchall()
+                    for pr in page_rows:
+                        pid = int(pr["page_id"])
                         self.conn.execute(
                             "UPDATE artifacts SET status=?, updated_at=?, error_code=?, error_message=? WHERE page_id=? AND kind=?",
                             (
@@ -1140,119 +1165,260 @@ class JobManager:
                                 "PDF_CONVERT_FAIL",
                                 str(exc)[:500],
                                 pid,
-                                ArtifactKind.IMG_VEC,
+                                ArtifactKind.THUMB,
                             ),
                         )
-                processed_pages += len(page_rows)
-                if total_pages:
-                    self._task_progress(
-                        task_id,
-                        progress=processed_pages / total_pages,
-                        message=f"thumb {processed_pages}/{total_pages}",
-                        page_id=page_rows[-1]["page_id"] if page_rows else None,
-                        file_id=file_id,
-                    )
-                self.conn.commit()
-                continue
-
-            thumb_tasks = self.conn.execute(
-                "SELECT p.page_id, p.page_no, p.aspect "
-                "FROM pages p "
-                "JOIN artifacts a ON a.page_id=p.page_id "
-                "WHERE a.kind=? AND a.status=? AND p.file_id=? "
-                "ORDER BY p.page_no",
-                (ArtifactKind.THUMB, ArtifactStatus.QUEUED, file_id),
-            ).fetchall()
-
-            thumb_root = root / ".slidemanager" / "thumbs" / str(file_id)
-            for tr in thumb_tasks:
-                await pause.wait_if_paused()
-                await cancel.check()
-                page_id = int(tr["page_id"])
-                page_no = int(tr["page_no"])
-                p_aspect = str(tr["aspect"] or aspect)
-
-                w, h = thumb_size(
-                    p_aspect if p_aspect in ("4:3", "16:9") else "unknown",
-                    options.thumb.width,
-                    options.thumb.height_4_3,
-                    options.thumb.height_16_9,
-                )
-                out_img = thumb_root / f"{page_no}_{p_aspect}_{w}x{h}.jpg"
-
-                now2 = now_epoch()
-                self.conn.execute(
-                    "UPDATE artifacts SET status=?, updated_at=? WHERE page_id=? AND kind=?",
-                    (ArtifactStatus.RUNNING, now2, page_id, ArtifactKind.THUMB),
-                )
-                try:
-                    await asyncio.to_thread(
-                        render_pdf_page_to_thumb,
-                        out_pdf,
-                        page_no - 1,
-                        out_img,
-                        w,
-                        h,
-                    )
-                    now2 = now_epoch()
-                    self.conn.execute(
-                        "INSERT OR REPLACE INTO thumbnails(page_id,aspect,width,height,image_path,updated_at) VALUES (?,?,?,?,?,?)",
-                        (page_id, p_aspect, w, h, str(out_img), now2),
-                    )
-                    self.conn.execute(
-                        "UPDATE artifacts SET status=?, updated_at=?, attempts=attempts+1 WHERE page_id=? AND kind=?",
-                        (ArtifactStatus.READY, now2, page_id, ArtifactKind.THUMB),
-                    )
-                    self.conn.commit()
-
-                    await self.bus.publish(
-                        job_id,
-                        "artifact_state_changed",
-                        {
-                            "page_id": page_id,
-                            "kind": "thumb",
-                            "status": "ready",
-                            "file": str(pptx_path),
-                            "page_no": page_no,
-                        },
-                        ts=now_epoch(),
-                    )
-                    processed_pages += 1
-                    if total_pages:
-                        self._task_progress(
-                            task_id,
-                            progress=processed_pages / total_pages,
-                            message=f"thumb {processed_pages}/{total_pages}",
-                            page_id=page_id,
-                            file_id=file_id,
-                        )
-                except Exception as exc:
-                    logger.exception("thumb render failed: %s", exc)
-                    now2 = now_epoch()
-                    self.conn.execute(
-                        "UPDATE artifacts SET status=?, updated_at=?, error_code=?, error_message=?, attempts=attempts+1 WHERE page_id=? AND kind=?",
-                        (
-                            ArtifactStatus.ERROR,
-                            now2,
-                            "THUMB_FAIL",
-                            str(exc)[:500],
-                            page_id,
-                            ArtifactKind.THUMB,
-                        ),
-                    )
-                    processed_pages += 1
+                        if options.enable_img_vec and options.embed.enabled_image:
+                            self.conn.execute(
+                                "UPDATE artifacts SET status=?, updated_at=?, error_code=?, error_message=? WHERE page_id=? AND kind=?",
+                                (
+                                    ArtifactStatus.ERROR,
+                                    now,
+                                    "PDF_CONVERT_FAIL",
+                                    str(exc)[:500],
+                                    pid,
+                                    ArtifactKind.IMG_VEC,
+                                ),
+                            )
+                    processed_pages += len(page_rows)
                     if total_pages:
                         self._task_progress(
                             task_id,
                             progress=processed_pages / total_pages,
                             message=f"thumb {processed_pages}/{total_pages}",
-                            page_id=page_id,
+                            page_id=page_rows[-1]["page_id"] if page_rows else None,
                             file_id=file_id,
                         )
                     self.conn.commit()
                     continue
+
+                pdf_doc = None
+                if len(fresh) < len(targets):
+                    try:
+                        pdf_doc = await asyncio.to_thread(open_pdf, out_pdf)
+                    except Exception as exc:
+                        logger.warning("pdf open failed, rendering per page: %s", exc)
+                render_failed = False
+                try:
+                    for page_id, page_no, p_aspect, w, h, out_img in targets:
+                        await pause.wait_if_paused()
+                        await cancel.check()
+
+                        now2 = now_epoch()
+                        self.conn.execute(
+                            "UPDATE artifacts SET status=?, updated_at=? WHERE page_id=? AND kind=?",
+                            (ArtifactStatus.RUNNING, now2, page_id, ArtifactKind.THUMB),
+                        )
+                        try:
+                            if page_id not in fresh:
+                                await asyncio.to_thread(
+                                    render_pdf_page_to_thumb,
+                                    out_pdf,
+                                    page_no - 1,
+                                    out_img,
+                                    w,
+                                    h,
+                                    pdf_doc,
+                                )
+                            now2 = now_epoch()
+                            self.conn.execute(
+                                "INSERT OR REPLACE INTO thumbnails(page_id,aspect,width,height,image_path,updated_at) VALUES (?,?,?,?,?,?)",
+                                (page_id, p_aspect, w, h, str(out_img), now2),
+                            )
+                            self.conn.execute(
+                                "UPDATE artifacts SET status=?, updated_at=?, attempts=attempts+1 WHERE page_id=? AND kind=?",
+                                (ArtifactStatus.READY, now2, page_id, ArtifactKind.THUMB),
+                            )
+                            self.conn.commit()
+
+                            await self.bus.publish(
+                                job_id,
+                                "artifact_state_changed",
+                                {
+                                    "page_id": page_id,
+                                    "kind": "thumb",
+                                    "status": "ready",
+                                    "file": str(pptx_path),
+                                    "page_no": page_no,
+                                },
+                                ts=now_epoch(),
+                            )
+                            processed_pages += 1
+                            if total_pages:
+                                self._task_progress(
+                                    task_id,
+                                    progress=processed_pages / total_pages,
+                                    message=f"thumb {processed_pages}/{total_pages}",
+                                    page_id=page_id,
+                                    file_id=file_id,
+                                )
+                        except Exception as exc:
+                            render_failed = True
+                            logger.exception("thumb render failed: %s", exc)
+                            now2 = now_epoch()
+                            self.conn.execute(
+                                "UPDATE artifacts SET status=?, updated_at=?, error_code=?, error_message=?, attempts=attempts+1 WHERE page_id=? AND kind=?",
+                                (
+                                    ArtifactStatus.ERROR,
+                                    now2,
+                                    "THUMB_FAIL",
+                                    str(exc)[:500],
+                                    page_id,
+                                    ArtifactKind.THUMB,
+                                ),
+                            )
+                            processed_pages += 1
+                            if total_pages:
+                                self._task_progress(
+                                    task_id,
+                                    progress=processed_pages / total_pages,
+                                    message=f"thumb {processed_pages}/{total_pages}",
+                                    page_id=page_id,
+                                    file_id=file_id,
+                                )
+                            self.conn.commit()
+                            continue
+                    if deck_sig and not render_failed and len(fresh) < len(targets):
+                        self._write_deck_signature(sig_path, deck_sig)
+                finally:
+                    if pdf_doc is not None:
+                        pdf_doc.close()
+        finally:
+            pending = [f for f in inflight if not f.done()]
+            if pending:
+                # Cancelled or failed mid-run: don't wait for the prefetched
+                # conversion, clean its profile up once the thread finishes.
+                pending[-1].add_done_callback(
+                    functools.partial(self._discard_lo_profile, lo_profile)
+                )
+            else:
+                shutil.rmtree(lo_profile, ignore_errors=True)
         self._task_finish_ok(task_id)
 
+    def _prepare_thumb_file(
+        self,
+        fr: sqlite3.Row,
+        root: Path,
+        pdf_dir: Path,
+        options: JobOptions,
+        soffice: Optional[str],
+        lo_profile: Path,
+    ) -> Tuple[Any, ...]:
+        """Resolve a deck's queued thumbnails and start its PDF conversion if needed."""
+        file_id = int(fr["file_id"])
+        pptx_path = Path(str(fr["path"]))
+        aspect = str(fr["slide_aspect"] or "unknown")
+        out_pdf = pdf_dir / f"{file_id}.pdf"
+
+        thumb_tasks = self.conn.execute(
+            "SELECT p.page_id, p.page_no, p.aspect "
+            "FROM pages p "
+            "JOIN artifacts a ON a.page_id=p.page_id "
+            "WHERE a.kind=? AND a.status=? AND p.file_id=? "
+            "ORDER BY p.page_no",
+            (ArtifactKind.THUMB, ArtifactStatus.QUEUED, file_id),
+        ).fetchall()
+
+        thumb_root = root / ".slidemanager" / "thumbs" / str(file_id)
+        targets = []
+        for tr in thumb_tasks:
+            page_no = int(tr["page_no"])
+            p_aspect = str(tr["aspect"] or aspect)
+            w, h = thumb_size(
+                p_aspect if p_aspect in ("4:3", "16:9") else "unknown",
+                options.thumb.width,
+                options.thumb.height_4_3,
+                options.thumb.height_16_9,
+            )
+            out_img = thumb_root / f"{page_no}_{p_aspect}_{w}x{h}.{options.thumb.format}"
+            targets.append((int(tr["page_id"]), page_no, p_aspect, w, h, out_img))
+
+        # Thumbnails already rendered from this exact deck can be reused as-is;
+        # when every page is covered the LibreOffice conversion is skipped too.
+        sig_path = thumb_root / "deck.sig"
+        deck_sig = self._deck_signature(pptx_path)
+        fresh = self._fresh_thumb_pages(targets, sig_path, deck_sig)
+        converting = None
+        if len(fresh) < len(targets):
+            thumb_root.mkdir(parents=True, exist_ok=True)
+            # Drop the stamp until this run has rendered every page again, so a
+            # crash part-way cannot bless thumbnails left over from an older deck.
+            try:
+                sig_path.unlink(missing_ok=True)
+            except OSError as exc:
+                logger.warning("thumb signature cleanup failed: %s", exc)
+            # The PDF kept from an earlier job is reusable when the deck is
+            # unchanged, e.g. when only the thumbnail size changed.
+            pdf_sig_path = out_pdf.with_suffix(".sig")
+            if out_pdf.exists() and self._signature_matches(pdf_sig_path, deck_sig):
+                logger.info("[INDEX_THUMB] reuse cached pdf file_id=%s", file_id)
+            else:
+                try:
+                    pdf_sig_path.unlink(missing_ok=True)
+                except OSError as exc:
+                    logger.warning("pdf signature cleanup failed: %s", exc)
+                converting = asyncio.ensure_future(
+                    asyncio.to_thread(
+                        convert_pptx_to_pdf_libreoffice,
+                        pptx_path,
+                        out_pdf,
+                        soffice,
+                        options.pdf.timeout_sec,
+                        lo_profile,
+                    )
+                )
+        elif targets:
+            logger.info("[INDEX_THUMB] reuse cached thumbs file_id=%s", file_id)
+        return file_id, pptx_path, out_pdf, targets, fresh, sig_path, deck_sig, converting
+
+    @staticmethod
+    def _discard_lo_profile(lo_profile: Path, fut: "asyncio.Future[None]") -> None:
+        if not fut.cancelled() and fut.exception() is not None:
+            logger.debug("abandoned pdf convert failed: %s", fut.exception())
+        shutil.rmtree(lo_profile, ignore_errors=True)
+
+    @staticmethod
+    def _deck_signature(pptx_path: Path) -> Optional[str]:
+        """Exact size and nanosecond mtime of the deck, or None if it cannot be read."""
+        try:
+            st = pptx_path.stat()
+        except OSError:
+            return None
+        return f"{st.st_size}:{st.st_mtime_ns}"
+
+    @classmethod
+    def _fresh_thumb_pages(
+        cls, targets: List[Tuple[Any, ...]], sig_path: Path, deck_sig: Optional[str]
+    ) -> Set[int]:
+        """Page ids whose thumbnail exists and was rendered from this exact deck."""
+        if not cls._signature_matches(sig_path, deck_sig):
+            return set()
+        fresh: Set[int] = set()
+        for page_id, _page_no, _aspect, _w, _h, out_img in targets:
+            try:
+                if out_img.stat().st_size > 0:
+                    fresh.add(page_id)
+            except OSError:
+                continue
+        return fresh
+
+    @staticmethod
+    def _signature_matches(sig_path: Path, deck_sig: Optional[str]) -> bool:
+        if deck_sig is None:
+            return False
+        try:
+            return sig_path.read_text(encoding="utf-8").strip() == deck_sig
+        except OSError:
+            return False
+
+    @staticmethod
+    def _write_deck_signature(sig_path: Path, deck_sig: str) -> None:
+        try:
+            sig_path.parent.mkdir(parents=True, exist_ok=True)
+            sig_path.write_text(deck_sig, encoding="utf-8")
+        except OSError as exc:
+            logger.warning("thumb signature write failed: %s", exc)
+
     async def _run_text_embeddings(
         self,
         job_id: str,
@@ -1297,7 +1463,10 @@ class JobManager:
             self.conn.commit()
             return
 
-        needs: List[Tuple[int, int, int, str, str, str]] = []
+        need_page_ids: List[int] = []
+        need_file_ids: List[int] = []
+        need_texts: List[str] = []
+        need_sigs: List[str] = []
         empty_text = 0
         cache_hit = 0
         processed = 0
@@ -1306,11 +1475,10 @@ class JobManager:
         for r in rows:
             page_id = int(r["page_id"])
             file_id = int(r["file_id"])
-            pptx_path = str(r["path"])
-            page_no = int(r["page_no"])
             norm = str(r["norm_text"] or "")
             stop_sentences = stop_sentences_map.get(file_id, set())
             filtered = self._filter_text_for_embedding(norm, stop_sentences)
+            has_text = bool(filtered) and not filtered.isspace()
             sig = fast_text_sig(filtered) if filtered else ""
 
             await pause.wait_if_paused()
@@ -1322,7 +1490,7 @@ class JobManager:
                 (ArtifactStatus.RUNNING, now, page_id, ArtifactKind.TEXT_VEC),
             )
 
-            if not filtered.strip():
+            if not has_text:
                 dim = 3072
                 vb = zero_vector(dim)
                 now = now_epoch()
@@ -1378,96 +1546,126 @@ class JobManager:
                     )
                     continue
 
-            needs.append((task_id, page_id, file_id, pptx_path, filtered, sig))
+            need_page_ids.append(page_id)
+            need_file_ids.append(file_id)
+            need_texts.append(filtered)
+            need_sigs.append(sig)
 
         logger.info(
             "[INDEX_TEXT_VEC] job_id=%s needs=%d empty_text=%d cache_hit=%d",
             job_id,
-            len(needs),
+            len(need_page_ids),
             empty_text,
             cache_hit,
         )
 
-        i = 0
-        while i < len(needs):
-            await pause.wait_if_paused()
-            await cancel.check()
-
-            batch = needs[i : i + options.embed.batch_size]
-            texts = [b[4] for b in batch]
+        batches = pack_text_batches(
+            need_texts,
+            options.embed.batch_size,
+            min(options.embed.max_batch_tokens, options.embed.tok_per_min),
+        )
+        concurrency = max(1, options.embed.max_concurrency)
+        # One client (and connection pool) for the whole stage instead of one per batch.
+        client = None
+        if batches:
             try:
-                vecs = await embed_text_batch_openai(
-                    texts,
-                    options.embed.model_text,
-                    limiter,
-                    options.embed.max_retries,
-                )
+                client = new_embedding_client()
             except Exception as exc:
-                logger.exception("embedding failed: %s", exc)
-                now = now_epoch()
-                for (task_id, page_id, file_id, _pptx, _norm, _sig) in batch:
-                    self.conn.execute(
-                        "UPDATE artifacts SET status=?, updated_at=?, error_code=?, error_message=? WHERE page_id=? AND kind=?",
-                        (
-                            ArtifactStatus.ERROR,
-                            now,
-                            "EMBED_FAIL",
-                            str(exc)[:500],
-                            page_id,
-                            ArtifactKind.TEXT_VEC,
-                        ),
-                    )
-                    processed += 1
-                    self._task_progress(
-                        task_id,
-                        progress=processed / total,
-                        message=f"text_vec {processed}/{total}",
-                        page_id=page_id,
-                        file_id=file_id,
-                    )
-                self.conn.commit()
-                i += len(batch)
-                continue
-
-            now = now_epoch()
-            for (task_id, page_id, file_id, _pptx, _norm, sig), vec in zip(batch, vecs):
-                dim = len(vec)
-                vb = pack_f32(vec)
-                if sig:
-                    self.conn.execute(
-                        "INSERT OR REPLACE INTO embedding_cache_text(model,text_sig,dim,vector_blob,created_at) VALUES (?,?,?,?,?)",
-                        (options.embed.model_text, sig, dim, vb, now),
-                    )
-                    self.conn.execute(
-                        "INSERT OR REPLACE INTO page_text_embedding(page_id,model,text_sig,updated_at) VALUES (?,?,?,?)",
-                        (page_id, options.embed.model_text, sig, now),
-                    )
-                else:
-                    tmp_sig = f"__nosig__:{page_id}:{now}"
-                    self.conn.execute(
-                        "INSERT OR REPLACE INTO embedding_cache_text(model,text_sig,dim,vector_blob,created_at) VALUES (?,?,?,?,?)",
-                        (options.embed.model_text, tmp_sig, dim, vb, now),
-                    )
-                    self.conn.execute(
-                        "INSERT OR REPLACE INTO page_text_embedding(page_id,model,text_sig,updated_at) VALUES (?,?,?,?)",
-                        (page_id, options.embed.model_text, tmp_sig, now),
-                    )
+                logger.warning("embedding client unavailable: %s", exc)
+        try:
+            for w in range(0, len(batches), concurrency):
+                await pause.wait_if_paused()
+                await cancel.check()
 
-                self.conn.execute(
-                    "UPDATE artifacts SET status=?, updated_at=? WHERE page_id=? AND kind=?",
-                    (ArtifactStatus.READY, now, page_id, ArtifactKind.TEXT_VEC),
-                )
-                processed += 1
-                self._task_progress(
-                    task_id,
-                    progress=processed / total,
-                    message=f"text_vec {processed}/{total}",
-                    page_id=page_id,
-                    file_id=file_id,
+                window = batches[w : w + concurrency]
+                results = await asyncio.gather(
+                    *(
+                        embed_text_batch_openai(
+                            need_texts[i:j],
+                            options.embed.model_text,
+                            limiter,
+                            options.embed.max_retries,
+                            client,
+                        )
+                        for i, j in window
+                    ),
+                    return_exceptions=True,
                 )
+                for (i, j), vecs in zip(window, results):
+                    if isinstance(vecs, BaseException) and not isinstance(vecs, Exception):
+                        raise vecs
+                    batch_page_ids = need_page_ids[i:j]
+                    batch_file_ids = need_file_ids[i:j]
+                    if isinstance(vecs, Exception):
+                        exc = vecs
+                        logger.error("embedding failed: %s", exc, exc_info=exc)
+                        now = now_epoch()
+                        for page_id, file_id in zip(batch_page_ids, batch_file_ids):
+                            self.conn.execute(
+                                "UPDATE artifacts SET status=?, updated_at=?, error_code=?, error_message=? WHERE page_id=? AND kind=?",
+                                (
+                                    ArtifactStatus.ERROR,
+                                    now,
+                                    "EMBED_FAIL",
+                                    str(exc)[:500],
+                                    page_id,
+                                    ArtifactKind.TEXT_VEC,
+                                ),
+                            )
+                            processed += 1
+                            self._task_progress(
+                                task_id,
+                                progress=processed / total,
+                                message=f"text_vec {processed}/{total}",
+                                page_id=page_id,
+                                file_id=file_id,
+                            )
+                        self.conn.commit()
+                        continue
 
-            self.conn.commit()
-            i += len(batch)
+                    now = now_epoch()
+                    for page_id, file_id, sig, vec in zip(
+                        batch_page_ids, batch_file_ids, need_sigs[i:j], vecs
+                    ):
+                        dim = len(vec)
+                        vb = pack_f32(vec)
+                        if sig:
+                            self.conn.execute(
+                                "INSERT OR REPLACE INTO embedding_cache_text(model,text_sig,dim,vector_blob,created_at) VALUES (?,?,?,?,?)",
+                                (options.embed.model_text, sig, dim, vb, now),
+                            )
+                            self.conn.execute(
+                                "INSERT OR REPLACE INTO page_text_embedding(page_id,model,text_sig,updated_at) VALUES (?,?,?,?)",
+                                (page_id, options.embed.model_text, sig, now),
+                            )
+                        else:
+                            tmp_sig = f"__nosig__:{page_id}:{now}"
+                            self.conn.execute(
+                                "INSERT OR REPLACE INTO embedding_cache_text(model,text_sig,dim,vector_blob,created_at) VALUES (?,?,?,?,?)",
+                                (options.embed.model_text, tmp_sig, dim, vb, now),
+                            )
+                            self.conn.execute(
+                                "INSERT OR REPLACE INTO page_text_embedding(page_id,model,text_sig,updated_at) VALUES (?,?,?,?)",
+                                (page_id, options.embed.model_text, tmp_sig, now),
+                            )
+
+                        self.conn.execute(
+                            "UPDATE artifacts SET status=?, updated_at=? WHERE page_id=? AND kind=?",
+                            (ArtifactStatus.READY, now, page_id, ArtifactKind.TEXT_VEC),
+                        )
+                        processed += 1
+                        self._task_progress(
+                            task_id,
+                            progress=processed / total,
+                            message=f"text_vec {processed}/{total}",
+                            page_id=page_id,
+                            file_id=file_id,
+                        )
+
+                    self.conn.commit()
+        finally:
+            if client is not None:
+                await client.close()
         self._task_finish_ok(task_id)
         self.conn.commit()
 
@@ -1487,7 +1685,9 @@ class JobManager:
 
         filter_sql, filter_params = self._file_path_filter(options.file_paths)
         rows = self.conn.execute(
-            "SELECT p.page_id, p.page_no, p.file_id, f.path "
+            "SELECT p.page_id, p.page_no, p.file_id, f.path, "
+            "(SELECT t.image_path FROM thumbnails t WHERE t.page_id=p.page_id "
+            "ORDER BY t.updated_at DESC LIMIT 1) AS thumb_path "
             "FROM artifacts a "
             "JOIN pages p ON p.page_id=a.page_id "
             "JOIN files f ON f.file_id=p.file_id "
@@ -1557,130 +1757,141 @@ class JobManager:
 
         last_commit_ts = time.monotonic()
         total = len(rows)
+
+        # Thumbnails are decoded and resized on a small pool a few pages ahead of
+        # inference; PIL releases the GIL while it works.
+        prep_workers = max(1, min(4, _usable_cpus()))
+        prep_pool = ThreadPoolExecutor(max_workers=prep_workers, thread_name_prefix="img_prep")
+        prepared: Dict[int, "Future[Any]"] = {}
+
+        def prefetch(start: int) -> None:
+            for ahead in rows[start : start + 2 * prep_workers]:
+                pid = int(ahead["page_id"])
+                if ahead["thumb_path"] is not None and pid not in prepared:
+                    prepared[pid] = prep_pool.submit(
+                        _load_image_input,
+                        str(ahead["thumb_path"]),
+                        width,
+                        height,
+                        channels_first,
+                    )
+
         self._task_start(task_id)
-        for r in rows:
-            await pause.wait_if_paused()
-            await cancel.check()
+        try:
+            for idx, r in enumerate(rows):
+                await pause.wait_if_paused()
+                await cancel.check()
+                prefetch(idx)
 
-            page_id = int(r["page_id"])
-            file_id = int(r["file_id"])
-            pptx_path = str(r["path"])
-            page_no = int(r["page_no"])
+                page_id = int(r["page_id"])
+                file_id = int(r["file_id"])
+                pptx_path = str(r["path"])
+                page_no = int(r["page_no"])
 
-            now = now_epoch()
-            self.conn.execute(
-                "UPDATE artifacts SET status=?, updated_at=? WHERE page_id=? AND kind=?",
-                (ArtifactStatus.RUNNING, now, page_id, ArtifactKind.IMG_VEC),
-            )
-            thumb_row = self.conn.execute(
-                "SELECT image_path FROM thumbnails WHERE page_id=? ORDER BY updated_at DESC LIMIT 1",
-                (page_id,),
-            ).fetchone()
-            if thumb_row is None:
                 now = now_epoch()
                 self.conn.execute(
-                    "UPDATE artifacts SET status=?, updated_at=?, error_code=?, error_message=?, attempts=attempts+1 "
-                    "WHERE page_id=? AND kind=?",
-                    (
-                        ArtifactStatus.SKIPPED,
-                        now,
-                        "THUMB_MISSING",
-                        "thumbnail missing",
-                        page_id,
-                        ArtifactKind.IMG_VEC,
-                    ),
-                )
-                self.conn.commit()
-
-                skipped += 1
-                processed += 1
-                self._task_progress(
-                    task_id,
-                    progress=processed / total,
-                    message=f"img_vec {processed}/{total}",
-                    page_id=page_id,
-                    file_id=file_id,
+                    "UPDATE artifacts SET status=?, updated_at=? WHERE page_id=? AND kind=?",
+                    (ArtifactStatus.RUNNING, now, page_id, ArtifactKind.IMG_VEC),
                 )
+                if r["thumb_path"] is None:
+                    now = now_epoch()
+                    self.conn.execute(
+                        "UPDATE artifacts SET status=?, updated_at=?, error_code=?, error_message=?, attempts=attempts+1 "
+                        "WHERE page_id=? AND kind=?",
+                        (
+                            ArtifactStatus.SKIPPED,
+                            now,
+                            "THUMB_MISSING",
+                            "thumbnail missing",
+                            page_id,
+                            ArtifactKind.IMG_VEC,
+                        ),
+                    )
+                    self.conn.commit()
 
-                continue
+                    skipped += 1
+                    processed += 1
+                    self._task_progress(
+                        task_id,
+                        progress=processed / total,
+                        message=f"img_vec {processed}/{total}",
+                        page_id=page_id,
+                        file_id=file_id,
+                    )
 
-            thumb_path = str(thumb_row["image_path"])
-            try:
-                vec = await asyncio.to_thread(
-                    self._embed_image_onnx,
-                    session,
-                    input_name,
-                    output_name,
-                    thumb_path,
-                    width,
-                    height,
-                    channels_first,
-                )
-                now = now_epoch()
-                vb = pack_f32(vec)
-                self.conn.execute(
-                    "INSERT OR REPLACE INTO page_image_embedding(page_id,model,dim,vector_blob,updated_at) VALUES (?,?,?,?,?)",
-                    (page_id, model_id, len(vec), vb, now),
-                )
-                self.conn.execute(
-                    "UPDATE artifacts SET status=?, updated_at=?, attempts=attempts+1 WHERE page_id=? AND kind=?",
-                    (ArtifactStatus.READY, now, page_id, ArtifactKind.IMG_VEC),
-                )
+                    continue
 
-                processed += 1
-                self._task_progress(
-                    task_id,
-                    progress=processed / total,
-                    message=f"img_vec {processed}/{total}",
-                    page_id=page_id,
-                    file_id=file_id,
-                )
-                if processed % options.commit_every_pages == 0 or (
-                    time.monotonic() - last_commit_ts
-                ) >= options.commit_every_sec:
-                    self.conn.commit()
-                    last_commit_ts = time.monotonic()
+                try:
+                    arr = await asyncio.wrap_future(prepared.pop(page_id))
+                    vec = await asyncio.to_thread(
+                        self._embed_image_onnx, session, input_name, output_name, arr
+                    )
+                    now = now_epoch()
+                    vb = pack_f32(vec)
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO page_image_embedding(page_id,model,dim,vector_blob,updated_at) VALUES (?,?,?,?,?)",
+                        (page_id, model_id, len(vec), vb, now),
+                    )
+                    self.conn.execute(
+                        "UPDATE artifacts SET status=?, updated_at=?, attempts=attempts+1 WHERE page_id=? AND kind=?",
+                        (ArtifactStatus.READY, now, page_id, ArtifactKind.IMG_VEC),
+                    )
 
-                await self.bus.publish(
-                    job_id,
-                    "artifact_state_changed",
-                    {
-                        "page_id": page_id,
-                        "kind": "img_vec",
-                        "status": "ready",
-                        "file": pptx_path,
-                        "page_no": page_no,
-                    },
-                    ts=now_epoch(),
-                )
-            except Exception as exc:
-                now = now_epoch()
-                logger.exception("image embedding failed: %s", exc)
-                self.conn.execute(
-                    "UPDATE artifacts SET status=?, updated_at=?, error_code=?, error_message=?, attempts=attempts+1 "
-                    "WHERE page_id=? AND kind=?",
-                    (
-                        ArtifactStatus.ERROR,
-                        now,
-                        "IMG_VEC_FAIL",
-                        str(exc)[:500],
-                        page_id,
-                        ArtifactKind.IMG_VEC,
-                    ),
-                )
-                self.conn.commit()
+                    processed += 1
+                    self._task_progress(
+                        task_id,
+                        progress=processed / total,
+                        message=f"img_vec {processed}/{total}",
+                        page_id=page_id,
+                        file_id=file_id,
+                    )
+                    if processed % options.commit_every_pages == 0 or (
+                        time.monotonic() - last_commit_ts
+                    ) >= options.commit_every_sec:
+                        self.conn.commit()
+                        last_commit_ts = time.monotonic()
 
-                failed += 1
-                processed += 1
-                self._task_progress(
-                    task_id,
-                    progress=processed / total,
-                    message=f"img_vec {processed}/{total}",
-                    page_id=page_id,
-                    file_id=file_id,
-                )
-                continue
+                    await self.bus.publish(
+                        job_id,
+                        "artifact_state_changed",
+                        {
+                            "page_id": page_id,
+                            "kind": "img_vec",
+                            "status": "ready",
+                            "file": pptx_path,
+                            "page_no": page_no,
+                        },
+                        ts=now_epoch(),
+                    )
+                except Exception as exc:
+                    now = now_epoch()
+                    logger.exception("image embedding failed: %s", exc)
+                    self.conn.execute(
+                        "UPDATE artifacts SET status=?, updated_at=?, error_code=?, error_message=?, attempts=attempts+1 "
+                        "WHERE page_id=? AND kind=?",
+                        (
+                            ArtifactStatus.ERROR,
+                            now,
+                            "IMG_VEC_FAIL",
+                            str(exc)[:500],
+                            page_id,
+                            ArtifactKind.IMG_VEC,
+                        ),
+                    )
+                    self.conn.commit()
 
+                    failed += 1
+                    processed += 1
+                    self._task_progress(
+                        task_id,
+                        progress=processed / total,
+                        message=f"img_vec {processed}/{total}",
+                        page_id=page_id,
+                        file_id=file_id,
+                    )
+                    continue
+        finally:
+            prep_pool.shutdown(wait=False, cancel_futures=True)
         self._task_finish_ok(task_id)
         self.conn.commit()
         logger.info(
@@ -1694,9 +1905,19 @@ class JobManager:
 
     def _get_image_embedder(self, root: Path) -> tuple[object, dict[str, object]] | None:
         model_path = root / "cache" / "image_embedder.onnx"
-        if not model_path.exists():
+        try:
+            st = model_path.stat()
+        except OSError:
+            return None
+        if st.st_size <= 0:
+            logger.warning("image embedder model is empty: %s", model_path)
             return None
-        if self._image_embedder is not None and self._image_embedder_path == model_path:
+        model_sig = (st.st_size, st.st_mtime_ns)
+        if (
+            self._image_embedder is not None
+            and self._image_embedder_path == model_path
+            and self._image_embedder_sig == model_sig
+        ):
             return self._image_embedder, dict(self._image_embedder_info or {})
 
         import onnxruntime as ort
@@ -1738,6 +1959,7 @@ class JobManager:
         self._image_embedder = session
         self._image_embedder_info = info
         self._image_embedder_path = model_path
+        self._image_embedder_sig = model_sig
         return session, dict(info)
 
     def _embed_image_onnx(
@@ -1745,20 +1967,8 @@ class JobManager:
         session: object,
         input_name: str,
         output_name: str,
-        image_path: str,
-        width: int,
-        height: int,
-        channels_first: bool,
+        arr: Any,
     ) -> List[float]:
-        import numpy as np
-        from PIL import Image
-
-        img = Image.open(image_path).convert("RGB")
-        img = img.resize((width, height), Image.BICUBIC)
-        arr = np.asarray(img, dtype=np.float32) / 255.0
-        if channels_first:
-            arr = np.transpose(arr, (2, 0, 1))
-        arr = np.expand_dims(arr, axis=0).astype(np.float32)
         output = session.run([output_name], {input_name: arr})[0]
         vec = np.asarray(output, dtype=np.float32).reshape(-1)
         return vec.tolist()
@@ -1859,13 +2069,16 @@ def params_for_text(options: JobOptions) -> dict:
 
 
 def params_for_thumb(options: JobOptions, aspect: str) -> dict:
-    return {
+    params = {
         "v": 1,
         "w": options.thumb.width,
         "h43": options.thumb.height_4_3,
         "h169": options.thumb.height_16_9,
         "aspect": aspect,
     }
+    if options.thumb.format != "jpg":
+        params["fmt"] = options.thumb.format
+    return params
 
 
 def params_for_bm25(options: JobOptions) -> dict:
@@ -1877,13 +2090,16 @@ def params_for_text_vec(options: JobOptions) -> dict:
 
 
 def params_for_img_vec(options: JobOptions, aspect: str) -> dict:
+    thumb = {
+        "w": options.thumb.width,
+        "h43": options.thumb.height_4_3,
+        "h169": options.thumb.height_16_9,
+        "aspect": aspect,
+    }
+    if options.thumb.format != "jpg":
+        thumb["fmt"] = options.thumb.format
     return {
         "v": 1,
         "model": options.embed.model_image,
-        "thumb": {
-            "w": options.thumb.width,
-            "h43": options.thumb.height_4_3,
-            "h169": options.thumb.height_16_9,
-            "aspect": aspect,
-        },
+        "thumb": thumb,
     }
@@ -4,7 +4,7 @@ import shutil
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from app.backend_daemon.utils_win import is_windows, kill_process_tree_windows
 
@@ -16,74 +16,102 @@ def _file_url(path: Path) -> str:
     return "file://" + p
 
 
+_RESOLVED_SOFFICE: Dict[str, str] = {}
+
+
+def _resolve_soffice(soffice_path: str) -> str:
+    # Only successful PATH lookups are cached so a later install is still found.
+    cached = _RESOLVED_SOFFICE.get(soffice_path)
+    if cached is not None:
+        return cached
+    if Path(soffice_path).is_file():
+        return soffice_path
+    resolved = shutil.which(soffice_path)
+    if not resolved:
+        return soffice_path
+    _RESOLVED_SOFFICE[soffice_path] = resolved
+    return resolved
+
+
 def convert_pptx_to_pdf_libreoffice(
-    pptx_path: Path, out_pdf: Path, soffice_path: Optional[str], timeout_sec: int
+    pptx_path: Path,
+    out_pdf: Path,
+    soffice_path: Optional[str],
+    timeout_sec: int,
+    profile_dir: Optional[Path] = None,
 ) -> None:
+    """Reusing ``profile_dir`` across calls skips LibreOffice's first-start profile
+    setup; calls sharing a profile must not overlap."""
     if soffice_path is None:
         soffice_path = "soffice"
 
-    soffice_exec = soffice_path
-    if not Path(soffice_path).is_file():
-        resolved = shutil.which(soffice_path)
-        if resolved:
-            soffice_exec = resolved
+    soffice_exec = _resolve_soffice(soffice_path)
 
     out_pdf.parent.mkdir(parents=True, exist_ok=True)
 
+    if profile_dir is not None:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        _run_soffice(soffice_exec, pptx_path, out_pdf, timeout_sec, profile_dir)
+        return
     with tempfile.TemporaryDirectory(prefix="lo_profile_") as prof_dir:
-        prof_path = Path(prof_dir)
-        user_install = f"-env:UserInstallation={_file_url(prof_path)}"
-
-        cmd = [
-            soffice_exec,
-            "--headless",
-            "--nologo",
-            "--norestore",
-            "--nofirststartwizard",
-            user_install,
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(out_pdf.parent),
-            str(pptx_path),
-        ]
-
-        creationflags = 0
+        _run_soffice(soffice_exec, pptx_path, out_pdf, timeout_sec, Path(prof_dir))
+
+
+def _run_soffice(
+    soffice_exec: str, pptx_path: Path, out_pdf: Path, timeout_sec: int, prof_path: Path
+) -> None:
+    user_install = f"-env:UserInstallation={_file_url(prof_path)}"
+
+    cmd = [
+        soffice_exec,
+        "--headless",
+        "--nologo",
+        "--norestore",
+        "--nofirststartwizard",
+        user_install,
+        "--convert-to",
+        "pdf",
+        "--outdir",
+        str(out_pdf.parent),
+        str(pptx_path),
+    ]
+
+    creationflags = 0
+    if is_windows():
+        creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            creationflags=creationflags,
+        )
+    except FileNotFoundError as exc:
+        raise RuntimeError(
+            "LibreOffice not found. Please install LibreOffice or configure the "
+            "soffice path before converting PPTX to PDF."
+        ) from exc
+    try:
+        _stdout, stderr = proc.communicate(timeout=timeout_sec)
+    except subprocess.TimeoutExpired as exc:
         if is_windows():
-            creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
-
-        try:
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                creationflags=creationflags,
-            )
-        except FileNotFoundError as exc:
-            raise RuntimeError(
-                "LibreOffice not found. Please install LibreOffice or configure the "
-                "soffice path before converting PPTX to PDF."
-            ) from exc
-        try:
-            _stdout, stderr = proc.communicate(timeout=timeout_sec)
-        except subprocess.TimeoutExpired as exc:
-            if is_windows():
-                kill_process_tree_windows(proc.pid)
-            else:
-                proc.kill()
-            raise RuntimeError(
-                f"LibreOffice timeout after {timeout_sec}s: {pptx_path}"
-            ) from exc
-
-        if proc.returncode != 0:
-            raise RuntimeError(f"LibreOffice failed rc={proc.returncode}: {stderr[:500]}")
-
-        expected = out_pdf.parent / (pptx_path.stem + ".pdf")
-        if not expected.exists():
-            raise RuntimeError(f"PDF not produced: expected {expected}")
-
-        if expected.resolve() != out_pdf.resolve():
-            if out_pdf.exists():
-                out_pdf.unlink()
-            expected.replace(out_pdf)
+            kill_process_tree_windows(proc.pid)
+        else:
+            proc.kill()
+        raise RuntimeError(
+            f"LibreOffice timeout after {timeout_sec}s: {pptx_path}"
+        ) from exc
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"LibreOffice failed rc={proc.returncode}: {stderr[:500]}")
+
+    expected = out_pdf.parent / (pptx_path.stem + ".pdf")
+    if not expected.exists():
+        raise RuntimeError(f"PDF not produced: expected {expected}")
+
+    if expected.resolve() != out_pdf.resolve():
+        if out_pdf.exists():
+            out_pdf.unlink()
+        expected.replace(out_pdf)
@@ -1,21 +1,26 @@
 from __future__ import annotations
 
-import zipfile
 import xml.etree.ElementTree as ET
+import zipfile
 from typing import Literal
 
 Aspect = Literal["4:3", "16:9", "unknown"]
 
 P_NS = {"p": "http://schemas.openxmlformats.org/presentationml/2006/main"}
+SLDSZ_TAG = "{%s}sldSz" % P_NS["p"]
 
 
-def detect_aspect_from_pptx(pptx_path: str) -> Aspect:
+def detect_aspect_from_zip(zf: zipfile.ZipFile) -> Aspect:
     try:
-        with zipfile.ZipFile(pptx_path) as zf:
-            with zf.open("ppt/presentation.xml") as f:
-                xml = f.read()
-        root = ET.fromstring(xml)
-        sldSz = root.find(".//p:sldSz", namespaces=P_NS)
+        info = zf.NameToInfo.get("ppt/presentation.xml")
+        if info is None:
+            return "unknown"
+        with zf.open(info) as f:
+            sldSz = None
+            for _event, elem in ET.iterparse(f, events=("start",)):
+                if elem.tag == SLDSZ_TAG:
+                    sldSz = elem
+                    break
         if sldSz is None:
             return "unknown"
         cx = float(sldSz.attrib.get("cx", "0"))
@@ -30,3 +35,19 @@ def detect_aspect_from_pptx(pptx_path: str) -> Aspect:
         return "unknown"
     except Exception:
         return "unknown"
+
+
+def detect_aspect_from_pptx(pptx_path: str) -> Aspect:
+    try:
+        with zipfile.ZipFile(pptx_path) as zf:
+            return detect_aspect_from_zip(zf)
+    except Exception:
+        return "unknown"
+
+
+def count_slides_in_zip(zf: zipfile.ZipFile) -> int:
+    return sum(
+        1
+        for n in zf.NameToInfo
+        if n.startswith("ppt/slides/slide") and n.endswith(".xml")
+    )
@@ -26,33 +26,38 @@ class DualTokenBucket:
         self._lock = asyncio.Lock()
 
     async def acquire(self, req_cost: float, tok_cost: float) -> None:
-        while True:
-            async with self._lock:
-                now = time.monotonic()
-                elapsed = now - self.state.last_ts
-                self.state.last_ts = now
-                self.state.req_tokens = min(
-                    self.req_capacity, self.state.req_tokens + elapsed * self.req_rate
-                )
-                self.state.tok_tokens = min(
-                    self.tok_capacity, self.state.tok_tokens + elapsed * self.tok_rate
-                )
-
-                if (
-                    self.state.req_tokens >= req_cost
-                    and self.state.tok_tokens >= tok_cost
-                ):
-                    self.state.req_tokens -= req_cost
-                    self.state.tok_tokens -= tok_cost
-                    return
-
-                need_req = max(0.0, req_cost - self.state.req_tokens)
-                need_tok = max(0.0, tok_cost - self.state.tok_tokens)
-                wait_req = need_req / self.req_rate if self.req_rate > 0 else 0.5
-                wait_tok = need_tok / self.tok_rate if self.tok_rate > 0 else 0.5
-                wait = max(wait_req, wait_tok, 0.05)
-
-            await asyncio.sleep(min(wait, 2.0))
+        """Reserve capacity immediately and sleep once until it is covered.
+
+        Buckets may go negative; the debt is what later callers queue behind,
+        so concurrent waiters are paced in arrival order without re-polling.
+        """
+        async with self._lock:
+            now = time.monotonic()
+            elapsed = max(0.0, now - self.state.last_ts)
+            self.state.last_ts = now
+            self.state.req_tokens = min(
+                self.req_capacity, self.state.req_tokens + elapsed * self.req_rate
+            )
+            self.state.tok_tokens = min(
+                self.tok_capacity, self.state.tok_tokens + elapsed * self.tok_rate
+            )
+            self.state.req_tokens -= req_cost
+            self.state.tok_tokens -= tok_cost
+
+            wait_req = (
+                -self.state.req_tokens / self.req_rate
+                if self.state.req_tokens < 0 and self.req_rate > 0
+                else 0.0
+            )
+            wait_tok = (
+                -self.state.tok_tokens / self.tok_rate
+                if self.state.tok_tokens < 0 and self.tok_rate > 0
+                else 0.0
+            )
+            wait = max(wait_req, wait_tok)
+
+        if wait > 0:
+            await asyncio.sleep(wait)
 
 
 def backoff_delay(attempt: int, base: float = 0.5, cap: float = 20.0) -> float:
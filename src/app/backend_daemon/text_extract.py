@@ -1,26 +1,32 @@
 from __future__ import annotations
 
 import hashlib
+import io
 import re
 import zipfile
 import xml.etree.ElementTree as ET
-from typing import Tuple
+from typing import IO, Tuple
 
 A_NS = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+A_T_TAG = "{%s}t" % A_NS["a"]
 
 _ws_re = re.compile(r"\s+")
 _zero_width = "\u200b"
 
 
-def extract_text_from_slide_xml(xml_bytes: bytes) -> str:
-    root = ET.fromstring(xml_bytes)
+def _extract_text_from_stream(source: IO[bytes]) -> str:
     texts = []
-    for t in root.findall(".//a:t", namespaces=A_NS):
-        if t.text:
-            texts.append(t.text)
+    for _event, elem in ET.iterparse(source, events=("end",)):
+        if elem.tag == A_T_TAG and elem.text:
+            texts.append(elem.text)
+        elem.clear()
     return "\n".join(texts)
 
 
+def extract_text_from_slide_xml(xml_bytes: bytes) -> str:
+    return _extract_text_from_stream(io.BytesIO(xml_bytes))
+
+
 def normalize_text(s: str) -> str:
     s = s.replace(_zero_width, "")
     s = s.replace("\r\n", "\n").replace("\r", "\n")
@@ -38,8 +44,7 @@ def extract_page_text(pptx_path: str, page_no: int) -> Tuple[str, str, str]:
     slide_name = f"ppt/slides/slide{page_no}.xml"
     with zipfile.ZipFile(pptx_path) as zf:
         with zf.open(slide_name) as f:
-            xml = f.read()
-    raw = extract_text_from_slide_xml(xml)
+            raw = _extract_text_from_stream(f)
     norm = normalize_text(raw)
     sig = fast_text_sig(norm) if norm else ""
     return raw, norm, sig
@@ -2,26 +2,50 @@ from __future__ import annotations
 
 import importlib
 import importlib.util
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal, Tuple
+from typing import Any, Tuple
 
 from PIL import Image
 
-Aspect = Literal["4:3", "16:9", "unknown"]
+from app.backend_daemon.pptx_meta import Aspect
+
+
+@lru_cache(maxsize=None)
+def _fitz() -> Any:
+    """Import PyMuPDF once; None when it is not installed."""
+    if importlib.util.find_spec("fitz") is None:
+        return None
+    return importlib.import_module("fitz")
+
+
+def open_pdf(pdf_path: Path) -> Any:
+    """Open a PDF once for rendering many pages; None when PyMuPDF is missing."""
+    fitz = _fitz()
+    if fitz is None:
+        return None
+    return fitz.open(pdf_path)
 
 
 def render_pdf_page_to_thumb(
-    pdf_path: Path, page_index0: int, out_path: Path, width: int, height: int
+    pdf_path: Path,
+    page_index0: int,
+    out_path: Path,
+    width: int,
+    height: int,
+    doc: Any = None,
 ) -> None:
-    if importlib.util.find_spec("fitz") is None:
+    owned = doc is None
+    if owned:
+        # Callers sharing a doc render a whole deck and create its folder once.
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        Image.new("RGB", (width, height), color="white").save(out_path)
+    fitz = _fitz()
+    if fitz is None:
+        _save_image(Image.new("RGB", (width, height), color="white"), out_path)
         return
 
-    fitz = importlib.import_module("fitz")
-
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    doc = fitz.open(pdf_path)
+    if owned:
+        doc = fitz.open(pdf_path)
     try:
         page = doc.load_page(page_index0)
         rect = page.rect
@@ -29,9 +53,21 @@ def render_pdf_page_to_thumb(
         sy = height / rect.height
         mat = fitz.Matrix(sx, sy)
         pix = page.get_pixmap(matrix=mat, alpha=False)
-        pix.save(str(out_path))
+        if out_path.suffix.lower() == ".webp":
+            # PyMuPDF cannot write WebP itself; hand the raw RGB samples to Pillow.
+            _save_image(Image.frombytes("RGB", (pix.width, pix.height), pix.samples), out_path)
+        else:
+            pix.save(str(out_path))
     finally:
-        doc.close()
+        if owned:
+            doc.close()
+
+
+def _save_image(img: Image.Image, out_path: Path) -> None:
+    if out_path.suffix.lower() == ".webp":
+        img.save(out_path, format="WEBP", quality=80, method=4)
+    else:
+        img.save(out_path)
 
 
 def thumb_size(
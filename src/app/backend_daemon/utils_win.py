@@ -21,10 +21,18 @@ def kill_process_tree_windows(pid: int) -> None:
     )
 
 
+_soffice_windows: Optional[str] = None
+
+
 def which_soffice_windows() -> Optional[str]:
+    # Cache a found install only; a miss is re-probed on the next call.
+    global _soffice_windows
+    if _soffice_windows is not None:
+        return _soffice_windows
     for name in ("soffice.exe",):
         p = shutil.which(name)
         if p:
+            _soffice_windows = p
             return p
     candidates = [
         r"C:\Program Files\LibreOffice\program\soffice.exe",
@@ -32,5 +40,6 @@ def which_soffice_windows() -> Optional[str]:
     ]
     for c in candidates:
         if os.path.exists(c):
+            _soffice_windows = c
             return c
     return None
@@ -10,6 +10,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from PySide6.QtCore import QThread, Signal
 
 from app.core.backend_config import get_backend_base_url
@@ -106,13 +107,18 @@ class SseWorker(QThread):
 class BackendApiClient:
     def __init__(self, cfg: BackendConfig) -> None:
         self.cfg = cfg
+        # 共用連線池，避免每次呼叫都重新建立 TCP 連線
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
     def _url(self, path: str) -> str:
         return self.cfg.base_url.rstrip("/") + path
 
     def health(self) -> bool:
         try:
-            resp = requests.get(self._url("/health"), timeout=self.cfg.connect_timeout)
+            resp = self._session.get(self._url("/health"), timeout=self.cfg.connect_timeout)
             return resp.status_code == 200
         except Exception as exc:
             log.warning("health failed: %s", exc)
@@ -131,7 +137,7 @@ class BackendApiClient:
                 "plan_mode": plan_mode,
                 "options": merged_options,
             }
-            resp = requests.post(
+            resp = self._session.post(
                 self._url("/jobs/index"),
                 json=payload,
                 timeout=(self.cfg.connect_timeout, self.cfg.read_timeout),
@@ -143,7 +149,7 @@ class BackendApiClient:
                     "plan_mode": plan_mode,
                     **merged_options,
                 }
-                resp = requests.post(
+                resp = self._session.post(
                     self._url("/jobs/index"),
                     json=fallback_payload,
                     timeout=(self.cfg.connect_timeout, self.cfg.read_timeout),
@@ -208,7 +214,7 @@ class BackendApiClient:
 
     def pause_job(self, job_id: str) -> bool:
         try:
-            resp = requests.post(
+            resp = self._session.post(
                 self._url(f"/jobs/{job_id}/pause"),
                 timeout=self.cfg.connect_timeout,
             )
@@ -220,7 +226,7 @@ class BackendApiClient:
 
     def resume_job(self, job_id: str) -> bool:
         try:
-            resp = requests.post(
+            resp = self._session.post(
                 self._url(f"/jobs/{job_id}/resume"),
                 timeout=self.cfg.connect_timeout,
             )
@@ -232,7 +238,7 @@ class BackendApiClient:
 
     def cancel_job(self, job_id: str) -> bool:
         try:
-            resp = requests.post(
+            resp = self._session.post(
                 self._url(f"/jobs/{job_id}/cancel"),
                 timeout=self.cfg.connect_timeout,
             )
@@ -244,7 +250,7 @@ class BackendApiClient:
 
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         try:
-            resp = requests.get(
+            resp = self._session.get(
                 self._url(f"/jobs/{job_id}"),
                 timeout=(self.cfg.connect_timeout, self.cfg.read_timeout),
             )
@@ -256,7 +262,7 @@ class BackendApiClient:
 
     def get_library_summary(self, library_root: str) -> Optional[Dict[str, Any]]:
         try:
-            resp = requests.get(
+            resp = self._session.get(
                 self._url("/library/summary"),
                 params={"library_root": library_root},
                 timeout=(self.cfg.connect_timeout, self.cfg.read_timeout),
@@ -269,7 +275,7 @@ class BackendApiClient:
 
     def get_library_files(self, library_root: str) -> Optional[Dict[str, Any]]:
         try:
-            resp = requests.get(
+            resp = self._session.get(
                 self._url("/library/files"),
                 params={"library_root": library_root},
                 timeout=(self.cfg.connect_timeout, self.cfg.read_timeout),
@@ -282,7 +288,7 @@ class BackendApiClient:
 
     def get_library_file_pages(self, file_id: int) -> Optional[Dict[str, Any]]:
         try:
-            resp = requests.get(
+            resp = self._session.get(
                 self._url(f"/library/files/{file_id}/pages"),
                 timeout=(self.cfg.connect_timeout, self.cfg.read_timeout),
             )
@@ -294,7 +300,7 @@ class BackendApiClient:
 
     def get_library_page(self, page_id: int) -> Optional[Dict[str, Any]]:
         try:
-            resp = requests.get(
+            resp = self._session.get(
                 self._url(f"/library/pages/{page_id}"),
                 timeout=(self.cfg.connect_timeout, self.cfg.read_timeout),
             )
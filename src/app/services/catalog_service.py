@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import os
 import time
+import zipfile
+from functools import lru_cache
 from pathlib import Path
 import base64
 from typing import Any, Dict, List, Optional, Callable
@@ -14,20 +16,28 @@ from app.services.project_store import ProjectStore
 log = get_logger(__name__)
 
 
-def _read_pptx_metadata(path: Path) -> Dict[str, Any]:
-    try:
-        import zipfile
+@lru_cache(maxsize=4096)
+def _count_slides_cached(abs_path: str, mtime: int, size: int) -> int:
+    """直接讀 zip 目錄計算投影片數；以 (路徑, mtime, size) 快取，失敗時拋出例外故不會被快取。"""
+    with zipfile.ZipFile(abs_path) as zf:
+        return sum(
+            1
+            for n in zf.namelist()
+            if n.startswith("ppt/slides/slide") and n.endswith(".xml")
+        )
 
-        with zipfile.ZipFile(path) as zf:
-            slide_count = sum(
-                1
-                for n in zf.namelist()
-                if n.startswith("ppt/slides/slide") and n.endswith(".xml")
-            )
-        return {"slide_count": slide_count, "core_properties": {}}
+
+def _read_slide_count(abs_path: str, mtime: int, size: int) -> Optional[int]:
+    try:
+        return _count_slides_cached(abs_path, mtime, size)
     except Exception as exc:
-        log.warning("讀取 metadata 失敗：%s (%s)", path, exc)
-        return {"slide_count": None, "core_properties": {}}
+        log.warning("讀取 metadata 失敗：%s (%s)", abs_path, exc)
+        return None
+
+
+def _read_pptx_metadata(path: Path, mtime: int, size: int) -> Dict[str, Any]:
+    return {"slide_count": _read_slide_count(str(path), mtime, size), "core_properties": {}}
+
 
 _SKIP_DIR_NAMES = {
     "appdata",
@@ -68,7 +78,7 @@ def _iter_pptx_files(root: Path, recursive: bool) -> List[Path]:
             )
         dirnames[:] = filtered_dirs
         for name in filenames:
-            if name.lower().endswith(".pptx"):
+            if name[-5:].lower() == ".pptx":
                 files.append(Path(current_root) / name)
     return files
 
@@ -77,6 +87,7 @@ def _build_file_fingerprint(abs_path: str, mtime: int, size: int) -> str:
     return f"{abs_path}|{mtime}|{size}"
 
 
+@lru_cache(maxsize=4096)
 def _make_file_id(abs_path: str) -> str:
     raw = abs_path.strip().encode("utf-8", errors="ignore")
     return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
@@ -260,7 +271,7 @@ class CatalogService:
                             slide_count = None
                         if core_props is None or slide_count is None:
                             try:
-                                meta = _read_pptx_metadata(path)
+                                meta = _read_pptx_metadata(path, mtime, size)
                                 core_props = meta.get("core_properties")
                                 slide_count = meta.get("slide_count")
                             except Exception:
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import os
+import shutil
+import struct
+import zipfile
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Set
+from typing import Any, Container, Dict, Iterable, Optional, Set, Tuple
 
 import numpy as np
 
@@ -18,52 +23,169 @@ FLOAT_DTYPE = np.float16 if hasattr(np, "float16") else np.float32
 
 SCHEMA_VERSION = "2.0"
 
+_ZIP_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+# 堆疊格式：snapshot 以單一 (N, D) 矩陣 + id 陣列存放，取代每個向量一個 zip 項目
+_STACK_IDS = "__ids__"
+_STACK_DATA = "__data__"
+# 選用的 int8 量化：__data__ 為 int8，__scales__ 為每列的縮放係數
+_STACK_SCALES = "__scales__"
+_STACK_NAMES = (_STACK_IDS, _STACK_DATA, _STACK_SCALES)
+
+
+def _quantize_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """對稱 int8 量化，每列一個 scale。"""
+    m = matrix.astype(np.float32)
+    scales = np.abs(m).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    q = np.clip(np.round(m / scales[:, None]), -127, 127).astype(np.int8)
+    return q, scales.astype(np.float16)
+
+
+def _select_rows(
+    members: Any,
+    keys: Optional[Set[str]] = None,
+    exclude: Container[str] = (),
+) -> Dict[str, np.ndarray]:
+    """從堆疊格式取出符合 keys/exclude 的列；只讀取並反量化被選中的列。"""
+    picked = [
+        (row, key)
+        for row, key in enumerate(members[_STACK_IDS].tolist())
+        if (keys is None or key in keys) and key not in exclude
+    ]
+    if not picked:
+        return {}
+    matrix = members[_STACK_DATA]
+    if len(picked) < matrix.shape[0]:
+        rows = np.fromiter((row for row, _ in picked), dtype=np.intp, count=len(picked))
+        matrix = matrix[rows]
+    else:
+        rows = slice(None)
+    if matrix.dtype == np.int8:
+        scales = members[_STACK_SCALES][rows].astype(np.float32)
+        matrix = (matrix.astype(np.float32) * scales[:, None]).astype(FLOAT_DTYPE)
+    return {key: matrix[i] for i, (_, key) in enumerate(picked)}
+
+
+def _mmap_npz_members(
+    path: Path, keys: Optional[Set[str]] = None, exclude: Container[str] = ()
+) -> Dict[str, np.ndarray]:
+    """以單一唯讀 memmap 取得 npz 內未壓縮（ZIP_STORED）陣列的視圖；壓縮項目照常解壓。"""
+    out: Dict[str, np.ndarray] = {}
+    buf: Optional[np.memmap] = None
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as fh:
+        for info in zf.infolist():
+            if not info.filename.endswith(".npy"):
+                continue
+            key = info.filename[:-4]
+            if key not in _STACK_NAMES and (
+                (keys is not None and key not in keys) or key in exclude
+            ):
+                continue
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as f:
+                    out[key] = np.lib.format.read_array(f, allow_pickle=False)
+                continue
+            fh.seek(info.header_offset)
+            header = _ZIP_LOCAL_HEADER.unpack(fh.read(_ZIP_LOCAL_HEADER.size))
+            fh.seek(info.header_offset + _ZIP_LOCAL_HEADER.size + header[-2] + header[-1])
+            version = np.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fh)
+            if dtype.hasobject:
+                raise ValueError(f"object arrays cannot be memory-mapped: {key}")
+            offset = fh.tell()
+            count = int(np.prod(shape, dtype=np.int64))
+            if count == 0:
+                out[key] = np.empty(shape, dtype=dtype)
+                continue
+            if buf is None:
+                buf = np.memmap(path, dtype=np.uint8, mode="r")
+            raw = buf[offset : offset + count * dtype.itemsize]
+            out[key] = raw.view(dtype).reshape(shape, order="F" if fortran_order else "C")
+    return out
+
+
+def _is_normalized_whitelist_entry(entry: Any) -> bool:
+    if isinstance(entry, str):
+        return bool(entry) and entry == entry.strip()
+    if isinstance(entry, dict):
+        path = entry.get("path")
+        return (
+            len(entry) == 3
+            and isinstance(path, str)
+            and bool(path)
+            and path == path.strip()
+            and isinstance(entry.get("enabled"), bool)
+            and isinstance(entry.get("recursive"), bool)
+        )
+    return False
+
+
+def _migrate_whitelist_entry(entry: Any) -> Any:
+    if isinstance(entry, str):
+        return entry.strip() or None
+    if isinstance(entry, dict):
+        path = str(entry.get("path", "")).strip()
+        if not path:
+            return None
+        return {
+            "path": path,
+            "enabled": bool(entry.get("enabled", True)),
+            "recursive": bool(entry.get("recursive", True)),
+        }
+    return None
 
-@dataclass
+
+@dataclass(frozen=True)
 class ProjectPaths:
+    """專案內各檔案路徑；root 不可變，衍生路徑只計算一次。"""
+
     root: Path
 
-    @property
+    @cached_property
     def app_state_json(self) -> Path:
         return self.root / "app_state.json"
 
-    @property
+    @cached_property
     def project_json(self) -> Path:
         return self.root / "project.json"
 
-    @property
+    @cached_property
     def manifest_json(self) -> Path:
         return self.root / "manifest.json"
 
-    @property
+    @cached_property
     def index_json(self) -> Path:
         return self.root / "index.json"
 
-    @property
+    @cached_property
     def slide_pages_json(self) -> Path:
         return self.root / "slide_pages.json"
 
-    @property
+    @cached_property
     def vec_text_npz(self) -> Path:
         return self.root / "vec_text_fp16.npz"
 
-    @property
+    @cached_property
     def vec_text_delta_npz(self) -> Path:
         return self.root / "vec_text_delta_fp16.npz"
 
-    @property
+    @cached_property
     def vec_image_npz(self) -> Path:
         return self.root / "vec_image_fp16.npz"
 
-    @property
+    @cached_property
     def vec_image_delta_npz(self) -> Path:
         return self.root / "vec_image_delta_fp16.npz"
 
-    @property
+    @cached_property
     def thumbs_dir(self) -> Path:
         return self.root / "cache" / "thumbs"
 
-    @property
+    @cached_property
     def cache_dir(self) -> Path:
         return self.root / "cache"
 
@@ -76,6 +198,9 @@ class ProjectStore:
     - 原子寫入 + .bak
     """
 
+    delta_compact_bytes = 16 << 20
+    quantize_snapshots = False
+
     def __init__(self, project_root: Path):
         self.paths = ProjectPaths(project_root)
         self.paths.root.mkdir(parents=True, exist_ok=True)
@@ -94,9 +219,6 @@ class ProjectStore:
         return self.load_app_state()
 
     def save_project(self, data: Dict[str, Any]) -> None:
-        data = dict(data)
-        data["schema_version"] = SCHEMA_VERSION
-        atomic_write_json(self.paths.project_json, data)
         self.save_app_state(data)
 
     def load_catalog(self) -> Dict[str, Any]:
@@ -133,7 +255,8 @@ class ProjectStore:
         data = dict(data)
         data["schema_version"] = SCHEMA_VERSION
         atomic_write_json(self.paths.app_state_json, data)
-        atomic_write_json(self.paths.project_json, data)
+        # project.json 只是舊版相容鏡像，可由 app_state.json 重建，不需 fsync 與備份
+        atomic_write_json(self.paths.project_json, data, keep_bak=False, durable=False)
 
     def _migrate_app_state(self, data: Any) -> Dict[str, Any]:
         if not isinstance(data, dict):
@@ -143,28 +266,22 @@ class ProjectStore:
                 "whitelist_dirs": [],
                 "recent_queries": [],
             }
+        if (
+            data.get("schema_version") == SCHEMA_VERSION
+            and isinstance(data.get("recent_queries"), list)
+            and isinstance(data.get("whitelist_dirs"), list)
+            and all(_is_normalized_whitelist_entry(e) for e in data["whitelist_dirs"])
+        ):
+            return data
         if "whitelist_dirs" not in data or not isinstance(data["whitelist_dirs"], list):
             data["whitelist_dirs"] = []
         if "recent_queries" not in data or not isinstance(data["recent_queries"], list):
             data["recent_queries"] = []
-        migrated: List[Any] = []
-        for entry in data.get("whitelist_dirs", []):
-            if isinstance(entry, str):
-                path = entry.strip()
-                if not path:
-                    continue
-                migrated.append(path)
-            elif isinstance(entry, dict):
-                path = str(entry.get("path", "")).strip()
-                if not path:
-                    continue
-                migrated.append(
-                    {
-                        "path": path,
-                        "enabled": bool(entry.get("enabled", True)),
-                        "recursive": bool(entry.get("recursive", True)),
-                    }
-                )
+        migrated = [
+            m
+            for m in map(_migrate_whitelist_entry, data["whitelist_dirs"])
+            if m is not None
+        ]
         data["whitelist_dirs"] = migrated
         data["schema_version"] = str(data.get("schema_version", SCHEMA_VERSION))
         return data
@@ -187,6 +304,12 @@ class ProjectStore:
     def _migrate_manifest(self, data: Any) -> Dict[str, Any]:
         if not isinstance(data, dict):
             return {"schema_version": SCHEMA_VERSION, "files": [], "stats": {}}
+        if (
+            data.get("schema_version") == SCHEMA_VERSION
+            and isinstance(data.get("files"), list)
+            and isinstance(data.get("stats"), dict)
+        ):
+            return data
         if "files" not in data or not isinstance(data["files"], list):
             data["files"] = []
         if "stats" not in data or not isinstance(data["stats"], dict):
@@ -206,12 +329,37 @@ class ProjectStore:
         return out
 
     def save_slide_pages(self, data: Dict[str, str]) -> None:
-        payload = {str(k): "" if v is None else str(v) for k, v in data.items()}
+        payload = data
+        if not all(type(k) is str and type(v) is str for k, v in data.items()):
+            payload = {str(k): "" if v is None else str(v) for k, v in data.items()}
         atomic_write_json(self.paths.slide_pages_json, payload)
 
+    # ---------------- Thumbnails ----------------
+    def scan_thumb_names(self) -> Dict[str, Set[str]]:
+        """一次列出各 file_id 縮圖資料夾內的檔名，取代逐頁 exists() 的 stat 呼叫。"""
+        out: Dict[str, Set[str]] = {}
+        try:
+            with os.scandir(self.paths.thumbs_dir) as it:
+                dirs = [entry for entry in it if entry.is_dir()]
+        except OSError:
+            return out
+        for entry in dirs:
+            try:
+                with os.scandir(entry.path) as it:
+                    out[entry.name] = {child.name for child in it}
+            except OSError as exc:
+                log.warning("列出縮圖資料夾失敗：%s (%s)", entry.path, exc)
+        return out
+
     def _migrate_meta(self, data: Any) -> Dict[str, Any]:
         if not isinstance(data, dict):
             return {"schema_version": SCHEMA_VERSION, "files": {}, "slides": {}}
+        if (
+            data.get("schema_version") == SCHEMA_VERSION
+            and isinstance(data.get("files"), dict)
+            and isinstance(data.get("slides"), dict)
+        ):
+            return data
         if "files" not in data or not isinstance(data["files"], dict):
             data["files"] = {}
         if "slides" not in data or not isinstance(data["slides"], dict):
@@ -220,11 +368,19 @@ class ProjectStore:
         return data
 
     # ---------------- Vectors ----------------
-    def load_text_vectors(self) -> Dict[str, np.ndarray]:
-        return self._load_vectors(self.paths.vec_text_npz, self.paths.vec_text_delta_npz)
-
-    def load_image_vectors(self) -> Dict[str, np.ndarray]:
-        return self._load_vectors(self.paths.vec_image_npz, self.paths.vec_image_delta_npz)
+    def load_text_vectors(
+        self, keys: Optional[Iterable[str]] = None, *, mmap: bool = False
+    ) -> Dict[str, np.ndarray]:
+        return self._load_vectors(
+            self.paths.vec_text_npz, self.paths.vec_text_delta_npz, keys, mmap=mmap
+        )
+
+    def load_image_vectors(
+        self, keys: Optional[Iterable[str]] = None, *, mmap: bool = False
+    ) -> Dict[str, np.ndarray]:
+        return self._load_vectors(
+            self.paths.vec_image_npz, self.paths.vec_image_delta_npz, keys, mmap=mmap
+        )
 
     def load_text_vector_keys(self) -> Set[str]:
         return self._load_vector_keys(self.paths.vec_text_npz, self.paths.vec_text_delta_npz)
@@ -232,11 +388,19 @@ class ProjectStore:
     def load_image_vector_keys(self) -> Set[str]:
         return self._load_vector_keys(self.paths.vec_image_npz, self.paths.vec_image_delta_npz)
 
-    def append_text_vectors(self, vectors: Dict[str, np.ndarray]) -> None:
+    def append_text_vectors(
+        self, vectors: Dict[str, np.ndarray], *, auto_compact: bool = False
+    ) -> None:
         self._append_vectors(self.paths.vec_text_delta_npz, vectors)
+        if auto_compact:
+            self._compact_if_large(self.paths.vec_text_npz, self.paths.vec_text_delta_npz)
 
-    def append_image_vectors(self, vectors: Dict[str, np.ndarray]) -> None:
+    def append_image_vectors(
+        self, vectors: Dict[str, np.ndarray], *, auto_compact: bool = False
+    ) -> None:
         self._append_vectors(self.paths.vec_image_delta_npz, vectors)
+        if auto_compact:
+            self._compact_if_large(self.paths.vec_image_npz, self.paths.vec_image_delta_npz)
 
     def compact_text_vectors(self) -> None:
         self._compact_vectors(self.paths.vec_text_npz, self.paths.vec_text_delta_npz)
@@ -250,9 +414,25 @@ class ProjectStore:
         if image and not self.paths.vec_image_npz.exists():
             self._save_npz_map(self.paths.vec_image_npz, {})
 
-    def _load_vectors(self, snapshot_path: Path, delta_path: Path) -> Dict[str, np.ndarray]:
-        vectors = self._load_npz_map(snapshot_path)
-        delta = self._load_npz_map(delta_path)
+    def _load_vectors(
+        self,
+        snapshot_path: Path,
+        delta_path: Path,
+        keys: Optional[Iterable[str]] = None,
+        *,
+        mmap: bool = False,
+    ) -> Dict[str, np.ndarray]:
+        """合併 snapshot 與 delta。
+
+        mmap=True 時，snapshot 中未壓縮的項目以唯讀記憶體映射回傳（不複製）；
+        呼叫端持有這些陣列期間，Windows 上無法覆寫 snapshot，compact 前請先釋放。
+        """
+        if keys is not None:
+            keys = set(keys)
+        delta = self._load_npz_map(delta_path, keys)
+        if keys is not None:
+            keys.difference_update(delta)
+        vectors = self._load_npz_map(snapshot_path, keys, exclude=delta, mmap=mmap)
         if delta:
             vectors.update(delta)
         return vectors
@@ -265,28 +445,96 @@ class ProjectStore:
     def _append_vectors(self, delta_path: Path, vectors: Dict[str, np.ndarray]) -> None:
         if not vectors:
             return
+        if delta_path.exists() and self._append_npz_members(delta_path, vectors):
+            return
         existing = self._load_npz_map(delta_path)
-        existing.update({k: np.asarray(v, dtype=FLOAT_DTYPE) for k, v in vectors.items()})
+        existing.update(vectors)
         self._save_npz_map(delta_path, existing)
 
+    def _append_npz_members(self, path: Path, vectors: Dict[str, np.ndarray]) -> bool:
+        """在既有 npz 的副本尾端追加新項目後換回原檔；key 已存在時回傳 False，由呼叫端改為整檔重寫。
+
+        直接以 "a" 模式改寫原檔時，若中途當機會留下中央目錄損毀的 delta，因此先寫副本再 replace。
+        """
+        tmp = path.with_name(path.name + ".tmp.npz")
+        try:
+            shutil.copyfile(path, tmp)
+            with zipfile.ZipFile(tmp, "a") as zf:
+                if f"{_STACK_IDS}.npy" in zf.NameToInfo or any(
+                    f"{k}.npy" in zf.NameToInfo for k in vectors
+                ):
+                    tmp.unlink()
+                    return False
+                for key, vec in vectors.items():
+                    with zf.open(f"{key}.npy", "w", force_zip64=True) as f:
+                        np.lib.format.write_array(
+                            f, np.asarray(vec, dtype=FLOAT_DTYPE), allow_pickle=False
+                        )
+            tmp.replace(path)
+            return True
+        except Exception as exc:
+            log.warning("追加向量 delta 失敗，改為整檔重寫：%s (%s)", path, exc)
+            try:
+                tmp.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return False
+
     def _compact_vectors(self, snapshot_path: Path, delta_path: Path) -> None:
-        snapshot = self._load_npz_map(snapshot_path)
         delta = self._load_npz_map(delta_path)
         if not delta:
             return
+        # 被 delta 覆蓋的 snapshot 項目不必解壓
+        snapshot = self._load_npz_map(snapshot_path, exclude=delta)
         snapshot.update(delta)
-        self._save_npz_map(snapshot_path, snapshot)
+        self._save_npz_map(
+            snapshot_path, snapshot, stacked=True, quantize=self.quantize_snapshots
+        )
         try:
             delta_path.unlink()
         except Exception as exc:
             log.warning("清除向量 delta 失敗：%s", exc)
 
-    def _load_npz_map(self, path: Path) -> Dict[str, np.ndarray]:
+    def _compact_if_large(self, snapshot_path: Path, delta_path: Path) -> None:
+        """delta 超過門檻時併入 snapshot，避免每次載入都要重讀越來越大的 delta。"""
+        try:
+            size = delta_path.stat().st_size
+        except OSError:
+            return
+        if size > self.delta_compact_bytes:
+            log.info("向量 delta 超過 %d bytes，自動合併：%s", self.delta_compact_bytes, delta_path)
+            self._compact_vectors(snapshot_path, delta_path)
+
+    def _load_npz_map(
+        self,
+        path: Path,
+        keys: Optional[Set[str]] = None,
+        *,
+        exclude: Container[str] = (),
+        mmap: bool = False,
+    ) -> Dict[str, np.ndarray]:
+        """讀取 npz；只解壓在 keys 中（未指定則全部）且不在 exclude 中的項目。"""
         if not path.exists():
             return {}
         try:
+            if mmap or keys is not None:
+                # 只挑部分 key 時也走 memmap，堆疊格式僅讀取被選中的列而非整個矩陣
+                members = _mmap_npz_members(path, keys, exclude)
+                if _STACK_IDS in members:
+                    selected = _select_rows(members, keys, exclude)
+                else:
+                    selected = members
+                if mmap:
+                    return selected
+                return {k: np.array(v) for k, v in selected.items()}
             with np.load(path, allow_pickle=False) as data:
-                return {k: data[k] for k in data.files}
+                if _STACK_IDS in data.files:
+                    return _select_rows(data, keys, exclude)
+                return {
+                    k: data[k]
+                    for k in data.files
+                    if (keys is None or k in keys) and k not in exclude
+                }
         except Exception as exc:
             log.warning("讀取向量檔失敗：%s (%s)", path, exc)
             return {}
@@ -296,22 +544,51 @@ class ProjectStore:
             return set()
         try:
             with np.load(path, allow_pickle=False) as data:
+                if _STACK_IDS in data.files:
+                    return set(data[_STACK_IDS].tolist())
                 return set(data.files)
         except Exception as exc:
             log.warning("讀取向量索引失敗：%s (%s)", path, exc)
             return set()
 
-    def _save_npz_map(self, path: Path, data: Dict[str, np.ndarray]) -> None:
+    def _save_npz_map(
+        self,
+        path: Path,
+        data: Dict[str, np.ndarray],
+        *,
+        compress: bool = False,
+        stacked: bool = False,
+        quantize: bool = False,
+        durable: bool = False,
+    ) -> None:
+        """寫入 npz；預設不壓縮（向量接近高熵，DEFLATE 只會拖慢存檔且無法 mmap）。
+
+        stacked=True 且所有向量同維度時改寫成堆疊格式，否則退回每個 key 一個項目；
+        堆疊格式下 quantize=True 會以 int8 存放（讀取時還原為 fp16，約有 1% 誤差）。
+        預設不 fsync，只靠 replace 的原子性；當機遺失的向量會在下次建索引時重新產生。
+        """
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
             tmp = path.with_name(path.name + ".tmp.npz")
+            # 已是 FLOAT_DTYPE 的 ndarray 時 asarray 直接回傳原物件，不會複製
             payload = {k: np.asarray(v, dtype=FLOAT_DTYPE) for k, v in data.items()}
-            saver = getattr(np, "savez_compressed", None)
-            if saver is None:
-                log.warning("numpy 缺少 savez_compressed，改用未壓縮 npz：%s", path)
-                np.savez(tmp, **payload)
-            else:
-                saver(tmp, **payload)
+            shapes = {v.shape for v in payload.values()}
+            if stacked and len(shapes) == 1 and len(next(iter(shapes))) == 1:
+                matrix = np.stack(list(payload.values()))
+                ids = np.array(list(payload), dtype=np.str_)
+                payload = {_STACK_IDS: ids, _STACK_DATA: matrix}
+                if quantize:
+                    payload[_STACK_DATA], payload[_STACK_SCALES] = _quantize_rows(matrix)
+            # 自行寫 zip 以便控制壓縮等級；savez_compressed 固定 zlib 預設等級 6
+            compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            with open(tmp, "wb") as fh:
+                with zipfile.ZipFile(fh, "w", compression, compresslevel=1) as zf:
+                    for key, vec in payload.items():
+                        with zf.open(f"{key}.npy", "w", force_zip64=True) as f:
+                            np.lib.format.write_array(f, vec, allow_pickle=False)
+                if durable:
+                    fh.flush()
+                    os.fsync(fh.fileno())
             tmp.replace(path)
         except Exception as exc:
             log.warning("寫入向量檔失敗：%s (%s)", path, exc)
@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import base64
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, Tuple
 
 from app.core.logging import get_logger
 from app.core.paths import secrets_path, app_home_dir
+from app.utils.json_io import atomic_write_json
 
 log = get_logger(__name__)
 
@@ -30,53 +31,89 @@ class SecretsService:
     def __init__(self):
         self._path = secrets_path()
         self._key_path = app_home_dir() / "secrets.key"
+        # 金鑰與 secrets.json 皆以 (size, mtime_ns) 判斷是否需重新讀取
+        self._fernet: Any = None
+        self._key_sig: Optional[Tuple[int, int]] = None
+        self._secrets: Optional[Secrets] = None
+        self._secrets_sig: Optional[Tuple[int, int]] = None
+
+    @staticmethod
+    def _file_sig(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _get_fernet(self, create: bool = False):
+        """取得 Fernet；金鑰檔不存在且 create=False 時回傳 None，不載入 cryptography。"""
+        sig = self._file_sig(self._key_path)
+        if sig is None and not create:
+            return None
 
-    def _get_fernet(self):
         from cryptography.fernet import Fernet
 
-        if not self._key_path.exists():
+        if sig is None:
             self._key_path.write_bytes(Fernet.generate_key())
-        key = self._key_path.read_bytes()
-        return Fernet(key)
+            sig = self._file_sig(self._key_path)
+        if self._fernet is None or sig != self._key_sig:
+            self._fernet = Fernet(self._key_path.read_bytes())
+            self._key_sig = sig
+        return self._fernet
 
     def load(self) -> Secrets:
-        if not self._path.exists():
-            return Secrets()
-        try:
-            data = json.loads(self._path.read_text(encoding="utf-8"))
-            return Secrets(
-                schema_version=str(data.get("schema_version", "1.0")),
-                openai_api_key_enc=data.get("openai_api_key_enc"),
-            )
-        except Exception as e:
-            log.error("讀取 secrets.json 失敗：%s", e)
+        sig = self._file_sig(self._path)
+        if sig is None:
             return Secrets()
+        if self._secrets is None or sig != self._secrets_sig:
+            try:
+                data = json.loads(self._path.read_text(encoding="utf-8"))
+                self._secrets = Secrets(
+                    schema_version=str(data.get("schema_version", "1.0")),
+                    openai_api_key_enc=data.get("openai_api_key_enc"),
+                )
+                self._secrets_sig = sig
+            except Exception as e:
+                log.error("讀取 secrets.json 失敗：%s", e)
+                return Secrets()
+        # 呼叫端會修改回傳值後再 save，回傳副本避免污染快取
+        return replace(self._secrets)
 
     def save(self, s: Secrets) -> None:
+        if (
+            self._secrets is not None
+            and self._secrets == s
+            and self._file_sig(self._path) == self._secrets_sig
+        ):
+            return
         try:
-            self._path.write_text(
-                json.dumps(
-                    {
-                        "schema_version": s.schema_version,
-                        "openai_api_key_enc": s.openai_api_key_enc,
-                    },
-                    ensure_ascii=False,
-                    indent=2,
-                ),
-                encoding="utf-8",
+            atomic_write_json(
+                self._path,
+                {
+                    "schema_version": s.schema_version,
+                    "openai_api_key_enc": s.openai_api_key_enc,
+                },
+                keep_bak=False,
+                # 內容為加密字串，不供人工編輯，不需縮排
+                compact=True,
             )
+            self._secrets = replace(s)
+            self._secrets_sig = self._file_sig(self._path)
         except Exception as e:
             log.error("寫入 secrets.json 失敗：%s", e)
 
     def set_openai_api_key(self, api_key: str) -> None:
         api_key = (api_key or "").strip()
+        if api_key and api_key == self.get_openai_api_key():
+            # 設定頁常重複寫入相同金鑰；每次加密的 token 都不同，不跳過就會重寫檔案
+            return
         if not api_key:
             s = self.load()
             s.openai_api_key_enc = None
             self.save(s)
             return
 
-        f = self._get_fernet()
+        f = self._get_fernet(create=True)
         token = f.encrypt(api_key.encode("utf-8"))
         s = self.load()
         s.openai_api_key_enc = token.decode("ascii")
@@ -88,6 +125,9 @@ class SecretsService:
             return None
         try:
             f = self._get_fernet()
+            if f is None:
+                log.error("找不到 secrets.key，無法解密 OpenAI API Key")
+                return None
             raw = f.decrypt(s.openai_api_key_enc.encode("ascii"))
             return raw.decode("utf-8")
         except Exception as e:
@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 import base64
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Optional
 
-from PySide6.QtCore import QThreadPool
+from PySide6.QtCore import QThreadPool, QTimer
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import (
     QFileDialog,
@@ -56,6 +56,7 @@ class MainWindow(QMainWindow):
 
         self.thread_pool = QThreadPool.globalInstance()
         self.settings: AppSettings = load_settings()
+        self._saved_settings = asdict(self.settings)
         self.secrets = SecretsService()
 
         self.ctx: Optional[AppContext] = None
@@ -89,7 +90,11 @@ class MainWindow(QMainWindow):
         self._build_menu()
         self._restore_window_state()
 
-        # 嘗試自動開啟上次專案
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        # 開啟上次專案會載入索引與各 tab 資料，延到視窗首次繪製之後再做
+        QTimer.singleShot(0, self._open_last_project)
+
+    def _open_last_project(self) -> None:
         if self.settings.last_project_dir:
             pr = Path(self.settings.last_project_dir)
             if pr.exists():
@@ -98,8 +103,6 @@ class MainWindow(QMainWindow):
         if self.ctx is None:
             self.status.showMessage("請先開啟或建立專案資料夾")
 
-        self.tabs.currentChanged.connect(self._on_tab_changed)
-
     # -------- UI chrome --------
     def _build_menu(self) -> None:
         tb = QToolBar("主工具列")
@@ -133,11 +136,19 @@ class MainWindow(QMainWindow):
             self.settings.window_geometry_b64 = base64.b64encode(self.saveGeometry()).decode("ascii")
             if self.ctx:
                 self.settings.last_project_dir = str(self.ctx.project_root)
-            save_settings(self.settings)
+            self._save_settings_if_changed()
         except Exception:
             log.exception("儲存視窗狀態失敗")
         super().closeEvent(event)
 
+    def _save_settings_if_changed(self) -> None:
+        """設定與上次寫入內容相同時不重寫 settings.json。"""
+        current = asdict(self.settings)
+        if current == self._saved_settings:
+            return
+        save_settings(self.settings)
+        self._saved_settings = current
+
     def _on_tab_changed(self, idx: int) -> None:
         self.settings.last_tab_index = int(idx)
         if self.tabs.widget(idx) is self.settings_tab and self.ctx:
@@ -187,7 +198,7 @@ class MainWindow(QMainWindow):
 
             self.status.showMessage(f"已開啟專案：{project_root}")
             self.settings.last_project_dir = str(project_root)
-            save_settings(self.settings)
+            self._save_settings_if_changed()
             self._disable_image_model_ui()
         except Exception as e:
             log.exception("開啟專案失敗：%s", e)
@@ -279,6 +279,7 @@ class DashboardTab(QWidget):
         image_vector_keys: set[str],
     ) -> DashboardMetrics:
         slides = []
+        thumb_names = self.ctx.store.scan_thumb_names()
         for slide_id, text in slide_pages.items():
             if not isinstance(slide_id, str) or "#" not in slide_id:
                 continue
@@ -288,12 +289,11 @@ class DashboardTab(QWidget):
             except Exception:
                 page_no = None
             text_value = "" if text is None else str(text)
-            thumb_path = self.ctx.store.paths.thumbs_dir / file_id / f"{page_no}.png" if page_no else None
             flags = {
                 "has_text": bool(text_value.strip()),
                 "has_bm25": bool(text_value.strip()),
                 "has_text_vec": slide_id in text_vector_keys,
-                "has_image": bool(thumb_path and thumb_path.exists()),
+                "has_image": bool(page_no) and f"{page_no}.png" in thumb_names.get(file_id, ()),
                 "has_image_vec": slide_id in image_vector_keys,
             }
             slides.append(
@@ -307,26 +307,18 @@ class DashboardTab(QWidget):
 
         docs = [f for f in files if not f.get("missing")]
         doc_total = len(docs)
-        doc_indexed = 0
-        doc_pending = 0
-        doc_stale = 0
-        doc_error = 0
-        doc_partial = 0
+        status_counts: Dict[str, int] = {}
         for entry in docs:
             status = classify_doc_status(
                 entry,
                 slides=[s for s in slides if s.get("file_id") == entry.get("file_id")],
             )
-            if status == "indexed":
-                doc_indexed += 1
-            elif status == "pending":
-                doc_pending += 1
-            elif status == "stale":
-                doc_stale += 1
-            elif status == "error":
-                doc_error += 1
-            elif status == "partial":
-                doc_partial += 1
+            status_counts[status] = status_counts.get(status, 0) + 1
+        doc_indexed = status_counts.get("indexed", 0)
+        doc_pending = status_counts.get("pending", 0)
+        doc_stale = status_counts.get("stale", 0)
+        doc_error = status_counts.get("error", 0)
+        doc_partial = status_counts.get("partial", 0)
 
         slide_total = self._compute_slide_total(docs, slides)
         slide_indexed = sum(1 for s in slides if self._is_slide_indexed(s))
@@ -486,7 +478,7 @@ class DashboardTab(QWidget):
             btn.setText(f"{btn.text().split(' ')[0]} {status_map.get(code, 0)}")
 
     def _set_ratio(self, row: _RatioRow, num: int, denom: int) -> None:
-        pct = int((num / denom) * 100) if denom > 0 else 0
+        pct = num * 100 // denom if denom > 0 else 0
         row.bar.setValue(pct)
         row.value.setText(f"{pct}%")
         row.label.setText(f"{row.label.text().split('（')[0].strip()}（{num} / {denom}）")
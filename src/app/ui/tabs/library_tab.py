@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import datetime
+import time
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Deque, Dict, List, Optional, Set
 
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QColor
@@ -100,6 +101,7 @@ class LibraryTab(QWidget):
         self._job_task_total: Optional[int] = None
         self._job_task_counts: Dict[str, int] = {}
         self._job_skip_reported = False
+        self._last_artifact_label_ts = 0.0
         self._job_poll_timer = QTimer(self)
         self._job_poll_timer.setInterval(2000)
         self._job_poll_timer.timeout.connect(self._poll_job_status)
@@ -107,7 +109,7 @@ class LibraryTab(QWidget):
         self._job_snapshot_timer.setSingleShot(True)
         self._job_snapshot_timer.setInterval(300)
         self._job_snapshot_timer.timeout.connect(self._request_job_snapshot)
-        self._pending_index_roots: List[str] = []
+        self._pending_index_roots: Deque[str] = deque()
         self._pending_index_options: Dict[str, Any] = {}
         self._pending_index_files_by_root: Dict[str, List[str]] = {}
         self._pending_index_scans_by_root: Dict[str, List[Dict[str, Any]]] = {}
@@ -432,6 +434,7 @@ class LibraryTab(QWidget):
                     text_vector_keys = cached_text_vector_keys
                     image_vector_keys = cached_image_vector_keys
                 slides_by_file_id: Dict[str, List[Dict[str, Any]]] = {}
+                thumb_names = ctx.store.scan_thumb_names()
                 for slide_id, text in slide_pages.items():
                     if not isinstance(slide_id, str):
                         continue
@@ -443,7 +446,7 @@ class LibraryTab(QWidget):
                     except Exception:
                         continue
                     thumb_path = ctx.store.paths.thumbs_dir / file_id / f"{page_no}.png"
-                    has_image = thumb_path.exists()
+                    has_image = f"{page_no}.png" in thumb_names.get(file_id, ())
                     text_value = "" if text is None else str(text)
                     flags = {
                         "has_text": bool(text_value.strip()),
@@ -571,8 +574,7 @@ class LibraryTab(QWidget):
                 fn = ""
         mtime = f.get("modified_time") or f.get("mtime") or f.get("modified_at")
         try:
-            dt = datetime.datetime.fromtimestamp(int(mtime))
-            mtime_s = dt.strftime("%Y-%m-%d %H:%M")
+            mtime_s = time.strftime("%Y-%m-%d %H:%M", time.localtime(int(mtime)))
         except Exception:
             mtime_s = ""
         size = f.get("size") or f.get("bytes") or 0
@@ -821,8 +823,6 @@ class LibraryTab(QWidget):
         self._cancel_prepare = False
 
         def task(_progress_emit):
-            import time
-
             if self._cancel_prepare:
                 return {"cancelled": True}
             log.info("[INDEX_FLOW][PREPARE] step=scan_before_index_selected")
@@ -1038,7 +1038,7 @@ class LibraryTab(QWidget):
                     if not ts:
                         return "未設定"
                     try:
-                        return datetime.datetime.fromtimestamp(int(ts)).strftime("%Y-%m-%d %H:%M:%S")
+                        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(int(ts)))
                     except Exception:
                         return "時間格式錯誤"
 
@@ -1289,7 +1289,7 @@ class LibraryTab(QWidget):
                 elif store.paths.index_json.exists():
                     source_ts = int(store.paths.index_json.stat().st_mtime)
                 else:
-                    source_ts = int(datetime.datetime.now().timestamp())
+                    source_ts = int(time.time())
                 updated = 0
                 total_entries = len(entries)
                 log.info(
@@ -1430,7 +1430,7 @@ class LibraryTab(QWidget):
             self._reset_prepare_ui()
             return
 
-        self._pending_index_roots = list(roots_with_files[1:])
+        self._pending_index_roots = deque(roots_with_files[1:])
         self._pending_index_options = dict(options)
         self._pending_index_files_by_root = files_by_root
         self._pending_index_scans_by_root = file_scans_by_root
@@ -1451,7 +1451,7 @@ class LibraryTab(QWidget):
             avg_extract_time = getattr(p, "avg_extract_time", None)
             avg_render_time = getattr(p, "avg_render_time", None)
             if total > 0:
-                self.prog.setValue(int(cur / total * 100))
+                self.prog.setValue(cur * 100 // total)
             metrics = []
             if avg_page_time is not None:
                 metrics.append(f"平均每頁 {avg_page_time:.2f} 秒")
@@ -1579,7 +1579,7 @@ class LibraryTab(QWidget):
             self.btn_pause.setEnabled(False)
             self.btn_index_needed.setEnabled(True)
             self.btn_index_selected.setEnabled(True)
-            self._pending_index_roots = []
+            self._pending_index_roots.clear()
             message = error_message or "啟動後台任務失敗，請確認 daemon 狀態"
             self.prog_label.setText(message)
             if hasattr(self.main_window, "show_toast"):
@@ -1619,13 +1619,17 @@ class LibraryTab(QWidget):
         ev_payload = payload.get("payload") or {}
         log.info("[INDEX_FLOW][EVENT] type=%s payload_keys=%s", event_type, list(ev_payload.keys()))
         if event_type == "artifact_state_changed":
-            file_path = ev_payload.get("file") or ""
-            page_no = ev_payload.get("page_no")
-            kind = ev_payload.get("kind")
-            msg = f"完成 {kind}：{file_path}"
-            if page_no:
-                msg = f"完成 {kind}：{file_path} (第 {page_no} 頁)"
-            self.prog_label.setText(msg)
+            # 每頁一個事件；標籤最多每 100ms 重繪一次，其餘僅更新快照排程
+            now = time.monotonic()
+            if now - self._last_artifact_label_ts >= 0.1:
+                self._last_artifact_label_ts = now
+                file_path = ev_payload.get("file") or ""
+                page_no = ev_payload.get("page_no")
+                kind = ev_payload.get("kind")
+                msg = f"完成 {kind}：{file_path}"
+                if page_no:
+                    msg = f"完成 {kind}：{file_path} (第 {page_no} 頁)"
+                self.prog_label.setText(msg)
         elif event_type == "stats_snapshot":
             if isinstance(ev_payload, dict):
                 self._apply_job_snapshot(ev_payload)
@@ -1792,7 +1796,7 @@ class LibraryTab(QWidget):
             )
 
         if total > 0:
-            percent = int(ready / total * 100)
+            percent = ready * 100 // total
             self.prog.setValue(percent)
             self.prog.setRange(0, 100)
             detail = f"{ready}/{total} 完成"
@@ -1835,7 +1839,7 @@ class LibraryTab(QWidget):
         self._cancel_index = True
         self._cancel_scan = True
         self._cancel_prepare = True
-        self._pending_index_roots = []
+        self._pending_index_roots.clear()
         self._pending_index_scans_by_root = {}
         if self._job_id and self.ctx:
             ok = self.ctx.indexer.cancel_job(self._job_id)
@@ -1899,7 +1903,7 @@ class LibraryTab(QWidget):
         if status == "completed" and self._pending_index_roots:
             next_root = None
             while self._pending_index_roots:
-                candidate = self._pending_index_roots.pop(0)
+                candidate = self._pending_index_roots.popleft()
                 if self._pending_index_files_by_root.get(candidate):
                     next_root = candidate
                     break
@@ -1915,7 +1919,7 @@ class LibraryTab(QWidget):
                 file_scans = self._pending_index_scans_by_root.get(next_root, [])
                 self._start_index_job_for_root(next_root, options, file_paths, file_scans)
         elif status in {"failed", "cancelled"}:
-            self._pending_index_roots = []
+            self._pending_index_roots.clear()
             self._pending_index_files_by_root = {}
             self._pending_index_scans_by_root = {}
         elif status == "completed" and not self._pending_index_roots:
@@ -206,6 +206,7 @@ class PageStatusTab(QWidget):
     ) -> Dict[str, Any]:
         file_map = {f.get("file_id"): f for f in files if f.get("file_id")}
         slides_by_file: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        thumb_names = self.ctx.store.scan_thumb_names()
         for slide_id, text in slide_pages.items():
             if not isinstance(slide_id, str) or "#" not in slide_id:
                 continue
@@ -215,12 +216,11 @@ class PageStatusTab(QWidget):
             except Exception:
                 continue
             text_value = "" if text is None else str(text)
-            thumb_path = self.ctx.store.paths.thumbs_dir / file_id / f"{slide_no}.png"
             flags = {
                 "has_text": bool(text_value.strip()),
                 "has_bm25": bool(text_value.strip()),
                 "has_text_vec": slide_id in text_vector_keys,
-                "has_image": thumb_path.exists(),
+                "has_image": f"{slide_no}.png" in thumb_names.get(file_id, ()),
                 "has_image_vec": slide_id in image_vector_keys,
             }
             slides_by_file.setdefault(file_id, {})[slide_no] = {
@@ -419,7 +419,7 @@ class PageStatusTab(QWidget):
         self._set_ratio(self.bm25_row, metrics.bm25_count, metrics.slide_total)
 
     def _set_ratio(self, row: _RatioRow, num: int, denom: int) -> None:
-        pct = int((num / denom) * 100) if denom > 0 else 0
+        pct = num * 100 // denom if denom > 0 else 0
         row.bar.setValue(pct)
         row.value.setText(f"{pct}%")
         label_title = row.label.text().split("（")[0].strip()
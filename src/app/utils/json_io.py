@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import importlib.util
 import json
+import os
+import shutil
 import time
 from pathlib import Path
 
 from app.core.logging import get_logger
 
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+else:
+    orjson = None
+
 log = get_logger(__name__)
 
 
@@ -25,22 +33,42 @@ def _cleanup_bak_files(path: Path, *, keep: int = 5) -> None:
             log.warning("刪除舊備份失敗：%s (%s)", bak, e)
 
 
-def atomic_write_json(path: Path, data: object, *, keep_bak: bool = True) -> None:
+def atomic_write_json(
+    path: Path,
+    data: object,
+    *,
+    keep_bak: bool = True,
+    durable: bool = True,
+    compact: bool = False,
+) -> None:
     """原子寫入 JSON：先寫 temp 再 replace。
 
     - 會產生 .bak 以利復原（可選）。
+    - durable=False 時略過 fsync，適用於可由其他檔案重建的鏡像檔。
+    - compact=True 時不縮排，適用於不供人工編輯的檔案。
     """
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(path.suffix + ".tmp")
 
-    text = json.dumps(data, ensure_ascii=False, indent=2)
-    tmp.write_text(text, encoding="utf-8")
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
 
     if keep_bak and path.exists():
         ts = time.strftime("%Y%m%d_%H%M%S")
         bak = path.with_suffix(path.suffix + f".{ts}.bak")
         try:
-            bak.write_bytes(path.read_bytes())
+            try:
+                # 硬連結即可保留舊內容：隨後的 replace 只會換掉 path 指向的 inode
+                os.link(path, bak)
+            except OSError:
+                shutil.copyfile(path, bak)
             _cleanup_bak_files(path, keep=5)
         except Exception as e:
             log.warning("寫入 .bak 失敗：%s", e)
@@ -58,6 +86,7 @@ def atomic_write_json(path: Path, data: object, *, keep_bak: bool = True) -> Non
 
     if last_err is not None:
         log.exception("原子寫入 JSON 失敗：%s (%s)", path, last_err)
+        tmp.unlink(missing_ok=True)
         raise last_err
 
 
@@ -65,7 +94,14 @@ def read_json(path: Path, default: object) -> object:
     if not path.exists():
         return default
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        raw = path.read_bytes()
+        if orjson is not None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # stdlib json 寫出的 NaN/Infinity 不是標準 JSON，交給 json 再試一次
+                pass
+        return json.loads(raw.decode("utf-8"))
     except Exception as e:
         log.error("[JSON_ERROR] 讀取 JSON 失敗：%s (%s)", path, e)
         return default
@@ -7,6 +7,7 @@ from typing import List
 
 
 _WORD_RE = re.compile(r"[A-Za-z0-9]+|[\u4e00-\u9fff]+", re.UNICODE)
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]+")
 
 
 def tokenize(text: str) -> List[str]:
@@ -19,7 +20,7 @@ def tokenize(text: str) -> List[str]:
         if not s:
             continue
         # CJK 長字串：拆成字 + 2-gram，提高召回
-        if re.fullmatch(r"[\u4e00-\u9fff]+", s) and len(s) > 1:
+        if len(s) > 1 and _CJK_RE.fullmatch(s):
             toks.extend(list(s))
             toks.extend([s[i : i + 2] for i in range(len(s) - 1)])
         else:
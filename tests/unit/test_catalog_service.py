@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests.helpers import build_pptx, build_slide_xml, ensure_src_path
+
+ROOT = ensure_src_path()
+
+from app.services.catalog_service import _read_slide_count
+
+
+class TestReadSlideCount(unittest.TestCase):
+    def test_failed_read_is_not_cached(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "demo.pptx"
+            path.write_bytes(b"partial copy")
+
+            self.assertIsNone(_read_slide_count(str(path), 1, 100))
+
+            build_pptx(path, [build_slide_xml(["a"]), build_slide_xml(["b"])])
+            self.assertEqual(_read_slide_count(str(path), 1, 100), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,7 +10,12 @@ from tests.helpers import ensure_src_path
 
 ROOT = ensure_src_path()
 
-from app.backend_daemon.embedder import estimate_tokens, zero_vector, embed_text_batch_openai
+from app.backend_daemon.embedder import (
+    embed_text_batch_openai,
+    estimate_tokens,
+    pack_text_batches,
+    zero_vector,
+)
 
 
 class TestEmbedder(unittest.IsolatedAsyncioTestCase):
@@ -23,41 +28,73 @@ class TestEmbedder(unittest.IsolatedAsyncioTestCase):
         blob = zero_vector(dim)
         self.assertEqual(len(blob), dim * 4)
 
+    def test_pack_text_batches_respects_item_limit(self) -> None:
+        self.assertEqual(pack_text_batches(["a"] * 5, max_items=2, max_tokens=1000), [(0, 2), (2, 4), (4, 5)])
+
+    def test_pack_text_batches_respects_token_limit(self) -> None:
+        texts = ["x" * 400, "x" * 400, "x" * 400, "y", "x" * 4000]
+        batches = pack_text_batches(texts, max_items=64, max_tokens=300)
+        self.assertEqual(batches, [(0, 2), (2, 4), (4, 5)])
+        self.assertEqual(pack_text_batches([], max_items=64, max_tokens=300), [])
+
     async def test_embed_text_batch_openai_success(self) -> None:
         limiter = SimpleNamespace(acquire=AsyncMock())
 
         class FakeEmbeddings:
-            def create(self, model: str, input: list[str]):
-                return SimpleNamespace(data=[SimpleNamespace(embedding=[0.1, 0.2]) for _ in input])
+            async def create(self, model: str, input: list[str]):
+                return SimpleNamespace(
+                    data=[SimpleNamespace(index=i, embedding=[0.1 * (i + 1)]) for i in reversed(range(len(input)))]
+                )
 
         class FakeClient:
             embeddings = FakeEmbeddings()
 
-        with patch("app.backend_daemon.embedder.OpenAI", return_value=FakeClient()):
-            vecs = await embed_text_batch_openai(["a", "b"], "m", limiter, max_retries=1)
+        vecs = await embed_text_batch_openai(["a", "b"], "m", limiter, max_retries=1, client=FakeClient())
 
-        self.assertEqual(len(vecs), 2)
-        self.assertEqual(vecs[0], [0.1, 0.2])
+        self.assertEqual(vecs, [[0.1], [0.2]])
         limiter.acquire.assert_awaited_once()
 
+    async def test_embed_text_batch_openai_closes_owned_client(self) -> None:
+        limiter = SimpleNamespace(acquire=AsyncMock())
+        closed = []
+
+        class FakeEmbeddings:
+            async def create(self, model: str, input: list[str]):
+                return SimpleNamespace(data=[SimpleNamespace(index=0, embedding=[1.0])])
+
+        class FakeClient:
+            embeddings = FakeEmbeddings()
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                closed.append(True)
+
+        with patch("app.backend_daemon.embedder.AsyncOpenAI", return_value=FakeClient()):
+            vecs = await embed_text_batch_openai(["a"], "m", limiter, max_retries=1)
+
+        self.assertEqual(vecs, [[1.0]])
+        self.assertEqual(closed, [True])
+
     async def test_embed_text_batch_openai_retries(self) -> None:
         limiter = SimpleNamespace(acquire=AsyncMock())
         calls = {"count": 0}
 
         class FakeEmbeddings:
-            def create(self, model: str, input: list[str]):
+            async def create(self, model: str, input: list[str]):
                 calls["count"] += 1
                 if calls["count"] < 3:
                     raise RuntimeError("429")
-                return SimpleNamespace(data=[SimpleNamespace(embedding=[0.1]) for _ in input])
+                return SimpleNamespace(
+                    data=[SimpleNamespace(index=i, embedding=[0.1]) for i in range(len(input))]
+                )
 
         class FakeClient:
             embeddings = FakeEmbeddings()
 
-        with patch("app.backend_daemon.embedder.OpenAI", return_value=FakeClient()), patch(
-            "app.backend_daemon.embedder.asyncio.sleep", new=AsyncMock()
-        ):
-            vecs = await embed_text_batch_openai(["a"], "m", limiter, max_retries=5)
+        with patch("app.backend_daemon.embedder.asyncio.sleep", new=AsyncMock()):
+            vecs = await embed_text_batch_openai(["a"], "m", limiter, max_retries=5, client=FakeClient())
 
         self.assertEqual(calls["count"], 3)
         self.assertEqual(vecs[0], [0.1])
@@ -67,18 +104,16 @@ class TestEmbedder(unittest.IsolatedAsyncioTestCase):
         calls = {"count": 0}
 
         class FakeEmbeddings:
-            def create(self, model: str, input: list[str]):
+            async def create(self, model: str, input: list[str]):
                 calls["count"] += 1
                 raise RuntimeError("429")
 
         class FakeClient:
             embeddings = FakeEmbeddings()
 
-        with patch("app.backend_daemon.embedder.OpenAI", return_value=FakeClient()), patch(
-            "app.backend_daemon.embedder.asyncio.sleep", new=AsyncMock()
-        ):
+        with patch("app.backend_daemon.embedder.asyncio.sleep", new=AsyncMock()):
             with self.assertRaises(RuntimeError):
-                await embed_text_batch_openai(["a"], "m", limiter, max_retries=2)
+                await embed_text_batch_openai(["a"], "m", limiter, max_retries=2, client=FakeClient())
 
         self.assertEqual(calls["count"], 3)
 
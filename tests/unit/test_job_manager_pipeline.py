@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import Any, List, Tuple
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image
+
+from tests.helpers import build_pdf, build_pptx, build_slide_xml, ensure_src_path, load_schema_sql
+
+ROOT = ensure_src_path()
+
+from app.backend_daemon.config import JobOptions
+from app.backend_daemon.event_bus import EventBus
+from app.backend_daemon.job_manager import CancelToken, JobManager, PauseToken, _load_image_input
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.shapes: List[Tuple[int, ...]] = []
+
+    def run(self, outputs: Any, feeds: dict) -> list:
+        arr = feeds["x"]
+        self.shapes.append(arr.shape)
+        return [arr.mean(axis=(2, 3))]
+
+
+class TestJobManagerPipeline(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.mgr = JobManager(self.root / "index.sqlite", load_schema_sql(ROOT), EventBus())
+        self.convert_calls: List[Tuple[str, Path]] = []
+
+    async def asyncTearDown(self) -> None:
+        self.mgr.conn.close()
+        self.temp_dir.cleanup()
+
+    def _seed_deck(self, name: str, pages: int, kinds: Tuple[str, ...] = ("thumb",)) -> int:
+        path = self.root / f"{name}.pptx"
+        build_pptx(path, [build_slide_xml([str(i)]) for i in range(pages)], aspect="4:3")
+        cur = self.mgr.conn.execute(
+            "INSERT INTO files(path,size_bytes,mtime_epoch,slide_aspect,last_scanned_at) VALUES (?,?,?,?,?)",
+            (str(path), 1, 1, "4:3", 1),
+        )
+        file_id = int(cur.lastrowid)
+        for page_no in range(1, pages + 1):
+            cur = self.mgr.conn.execute(
+                "INSERT INTO pages(file_id,page_no,aspect,source_size_bytes,source_mtime_epoch,created_at) VALUES (?,?,?,?,?,?)",
+                (file_id, page_no, "4:3", 1, 1, 1),
+            )
+            for kind in kinds:
+                self.mgr.conn.execute(
+                    "INSERT INTO artifacts(page_id,kind,status,updated_at) VALUES (?,?,?,?)",
+                    (int(cur.lastrowid), kind, "queued", 1),
+                )
+        self.mgr.conn.commit()
+        return file_id
+
+    def _requeue(self, kind: str) -> None:
+        self.mgr.conn.execute("UPDATE artifacts SET status='queued' WHERE kind=?", (kind,))
+        self.mgr.conn.commit()
+
+    def _statuses(self, kind: str) -> List[str]:
+        rows = self.mgr.conn.execute(
+            "SELECT status FROM artifacts WHERE kind=? ORDER BY page_id", (kind,)
+        ).fetchall()
+        return [r["status"] for r in rows]
+
+    def _fake_convert(
+        self, pptx: Path, out_pdf: Path, soffice: Any, timeout: int, profile: Path
+    ) -> None:
+        self.convert_calls.append((pptx.name, profile))
+        if pptx.name.startswith("bad"):
+            raise RuntimeError("soffice exited with 1")
+        build_pdf(out_pdf, pages=2, width=400, height=300)
+
+    async def _run_thumbs(self, options: JobOptions, cancel: CancelToken | None = None) -> None:
+        task_id = int(
+            self.mgr.conn.execute(
+                "INSERT INTO tasks(job_id,kind,status,priority) VALUES (?,?,?,?)",
+                ("job1", "thumb", "queued", 0),
+            ).lastrowid
+        )
+        with patch(
+            "app.backend_daemon.job_manager.convert_pptx_to_pdf_libreoffice",
+            new=self._fake_convert,
+        ):
+            await self.mgr._run_pdf_and_thumbs(
+                "job1", self.root, options, cancel or CancelToken(), PauseToken(), task_id
+            )
+
+    def _thumb_options(self) -> JobOptions:
+        options = JobOptions(enable_text=False, enable_bm25=False, enable_img_vec=False)
+        self.mgr._insert_job("job1", str(self.root), options)
+        return options
+
+    async def test_pipelined_conversion_recovers_from_failed_deck(self) -> None:
+        options = self._thumb_options()
+        for name in ("a", "bad", "c"):
+            self._seed_deck(name, 2)
+
+        await self._run_thumbs(options)
+
+        self.assertEqual([name for name, _ in self.convert_calls], ["a.pptx", "bad.pptx", "c.pptx"])
+        self.assertEqual(self._statuses("thumb"), ["ready", "ready", "error", "error", "ready", "ready"])
+        profiles = [profile for _, profile in self.convert_calls]
+        self.assertEqual(profiles[0], profiles[1])
+        self.assertNotEqual(profiles[1], profiles[2])
+        self.assertFalse(any(p.exists() for p in profiles))
+
+    async def test_thumbnails_reused_only_for_same_deck(self) -> None:
+        options = self._thumb_options()
+        self._seed_deck("a", 2)
+        await self._run_thumbs(options)
+        self.assertEqual(len(self.convert_calls), 1)
+
+        self._requeue("thumb")
+        await self._run_thumbs(options)
+        self.assertEqual(len(self.convert_calls), 1)
+        self.assertEqual(self._statuses("thumb"), ["ready", "ready"])
+
+        deck = self.root / "a.pptx"
+        st = deck.stat()
+        os.utime(deck, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        self._requeue("thumb")
+        await self._run_thumbs(options)
+        self.assertEqual(len(self.convert_calls), 2)
+
+    async def test_cached_pdf_reused_when_only_thumb_size_changes(self) -> None:
+        options = self._thumb_options()
+        self._seed_deck("a", 2)
+        await self._run_thumbs(options)
+
+        options.thumb.width = 160
+        self._requeue("thumb")
+        await self._run_thumbs(options)
+
+        self.assertEqual(len(self.convert_calls), 1)
+        self.assertEqual(self._statuses("thumb"), ["ready", "ready"])
+        rows = self.mgr.conn.execute("SELECT DISTINCT width FROM thumbnails ORDER BY width").fetchall()
+        self.assertEqual([r["width"] for r in rows], [160, 320])
+
+    async def test_cancel_does_not_wait_for_prefetched_conversion(self) -> None:
+        options = self._thumb_options()
+        self._seed_deck("a", 1)
+        self._seed_deck("slow", 1)
+        release = threading.Event()
+        fast_convert = self._fake_convert
+
+        def blocking_convert(pptx: Path, out_pdf: Path, soffice: Any, timeout: int, profile: Path) -> None:
+            fast_convert(pptx, out_pdf, soffice, timeout, profile)
+            if pptx.name.startswith("slow"):
+                release.wait(5)
+
+        self._fake_convert = blocking_convert  # type: ignore[method-assign]
+        cancel = CancelToken()
+
+        async def cancel_on_first_thumb(*args: Any, **kwargs: Any) -> None:
+            cancel.cancel()
+
+        self.mgr.bus.publish = cancel_on_first_thumb  # type: ignore[method-assign]
+        with self.assertRaises(asyncio.CancelledError):
+            await asyncio.wait_for(self._run_thumbs(options, cancel), timeout=2)
+
+        profile = self.convert_calls[-1][1]
+        self.assertTrue(profile.exists())
+        release.set()
+        for _ in range(50):
+            if not profile.exists():
+                break
+            await asyncio.sleep(0.05)
+        self.assertFalse(profile.exists())
+
+    async def test_image_embeddings_prefetch_all_pages(self) -> None:
+        options = JobOptions(enable_text=False, enable_bm25=False, enable_thumb=False)
+        options.embed.enabled_image = True
+        self.mgr._insert_job("job1", str(self.root), options)
+        self._seed_deck("a", 5, kinds=("img_vec",))
+        for page_id in range(1, 6):
+            thumb = self.root / f"thumb_{page_id}.jpg"
+            Image.new("RGB", (48, 36), (page_id * 40, 0, 0)).save(thumb)
+            self.mgr.conn.execute(
+                "INSERT INTO thumbnails(page_id,aspect,width,height,image_path,updated_at) VALUES (?,?,?,?,?,?)",
+                (page_id, "4:3", 48, 36, str(thumb), 1),
+            )
+        task_id = int(
+            self.mgr.conn.execute(
+                "INSERT INTO tasks(job_id,kind,status,priority) VALUES (?,?,?,?)",
+                ("job1", "img_vec", "queued", 0),
+            ).lastrowid
+        )
+        self.mgr.conn.commit()
+        session = FakeSession()
+        info = {
+            "input_name": "x",
+            "output_name": "y",
+            "width": 32,
+            "height": 32,
+            "channels_first": True,
+            "model_id": "onnx:fake",
+        }
+
+        with patch.object(JobManager, "_get_image_embedder", return_value=(session, info)):
+            await self.mgr._run_image_embeddings(
+                "job1", self.root, options, CancelToken(), PauseToken(), task_id
+            )
+
+        self.assertEqual(self._statuses("img_vec"), ["ready"] * 5)
+        self.assertEqual(session.shapes, [(1, 3, 32, 32)] * 5)
+        count = self.mgr.conn.execute("SELECT COUNT(*) FROM page_image_embedding").fetchone()[0]
+        self.assertEqual(count, 5)
+
+    def test_load_image_input_layout(self) -> None:
+        thumb = self.root / "thumb.jpg"
+        Image.new("RGB", (40, 30), (255, 255, 255)).save(thumb)
+
+        chw = _load_image_input(str(thumb), 16, 8, True)
+        hwc = _load_image_input(str(thumb), 16, 8, False)
+
+        self.assertEqual(chw.shape, (1, 3, 8, 16))
+        self.assertEqual(hwc.shape, (1, 8, 16, 3))
+        self.assertEqual(chw.dtype, np.float32)
+        self.assertAlmostEqual(float(chw.max()), 1.0, places=2)
+
+    def test_load_image_input_downscales_large_jpeg(self) -> None:
+        thumb = self.root / "large.jpg"
+        Image.new("RGB", (1280, 960), (0, 128, 255)).save(thumb)
+
+        arr = _load_image_input(str(thumb), 224, 224, True)
+
+        self.assertEqual(arr.shape, (1, 3, 224, 224))
+        np.testing.assert_allclose(arr[0, :, 112, 112], [0.0, 128 / 255, 1.0], atol=0.02)
+
+    def test_load_image_input_keeps_matching_size(self) -> None:
+        thumb = self.root / "thumb.png"
+        pixels = np.arange(8 * 16 * 3, dtype=np.uint8).reshape(8, 16, 3)
+        Image.fromarray(pixels).save(thumb)
+
+        arr = _load_image_input(str(thumb), 16, 8, False)
+
+        np.testing.assert_allclose(arr[0], pixels / 255.0, atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests.helpers import ensure_src_path
+
+ROOT = ensure_src_path()
+
+from app.utils.json_io import atomic_write_json, read_json
+
+
+class TestJsonIo(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_round_trip_keeps_non_ascii_and_nan(self) -> None:
+        path = self.root / "data.json"
+        atomic_write_json(path, {"名稱": "簡報", "score": float("nan")})
+
+        data = read_json(path, {})
+
+        self.assertEqual(data["名稱"], "簡報")
+        self.assertTrue(math.isnan(data["score"]))
+
+    def test_invalid_json_returns_default(self) -> None:
+        path = self.root / "broken.json"
+        path.write_text("{broken", encoding="utf-8")
+
+        self.assertEqual(read_json(path, {"fallback": True}), {"fallback": True})
+
+    def test_backup_keeps_previous_content(self) -> None:
+        path = self.root / "state.json"
+        atomic_write_json(path, {"v": 1})
+        atomic_write_json(path, {"v": 2})
+
+        baks = list(self.root.glob("state.json.*.bak"))
+        self.assertEqual(len(baks), 1)
+        self.assertEqual(read_json(baks[0], {}), {"v": 1})
+        self.assertEqual(read_json(path, {}), {"v": 2})
+
+    def test_compact_write(self) -> None:
+        path = self.root / "compact.json"
+        atomic_write_json(path, {"a": 1, "b": [1, 2]}, compact=True)
+
+        self.assertEqual(path.read_text(encoding="utf-8"), '{"a":1,"b":[1,2]}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -70,6 +70,27 @@ class TestPdfConvert(unittest.TestCase):
             self.assertTrue(out_pdf.exists())
             self.assertFalse(expected.exists())
 
+    def test_shared_profile_dir_is_reused(self) -> None:
+        proc = MagicMock()
+        proc.communicate.return_value = ("", "")
+        proc.returncode = 0
+        with tempfile.TemporaryDirectory() as td, patch(
+            "app.backend_daemon.pdf_convert.subprocess.Popen", return_value=proc
+        ) as popen, patch("app.backend_daemon.pdf_convert.is_windows", return_value=False):
+            root = Path(td)
+            profile = root / "profile"
+            for name in ("a", "b"):
+                (root / f"{name}.pdf").write_bytes(b"pdf")
+                convert_pptx_to_pdf_libreoffice(
+                    root / f"{name}.pptx", root / f"{name}.pdf", None, 1, profile
+                )
+            installs = {
+                next(arg for arg in call.args[0] if arg.startswith("-env:UserInstallation="))
+                for call in popen.call_args_list
+            }
+            self.assertEqual(len(installs), 1)
+            self.assertTrue(profile.is_dir())
+
 
 if __name__ == "__main__":
     unittest.main()
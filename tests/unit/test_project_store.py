@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from tests.helpers import ensure_src_path
+
+ROOT = ensure_src_path()
+
+from app.services.project_store import ProjectStore
+
+
+class TestProjectStoreVectors(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = ProjectStore(Path(self.temp_dir.name))
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_delta_overrides_snapshot(self) -> None:
+        self.store.append_text_vectors({"a": np.ones(3), "b": np.zeros(3)})
+        self.store.compact_text_vectors()
+        self.store.append_text_vectors({"b": np.full(3, 2.0), "c": np.full(3, 3.0)})
+
+        vectors = self.store.load_text_vectors()
+
+        self.assertEqual(set(vectors), {"a", "b", "c"})
+        np.testing.assert_array_equal(vectors["b"], np.full(3, 2.0, dtype=np.float16))
+        self.assertEqual(self.store.load_text_vector_keys(), {"a", "b", "c"})
+
+    def test_load_selected_keys(self) -> None:
+        self.store.append_image_vectors({"a": np.ones(2), "b": np.zeros(2)})
+        self.store.compact_image_vectors()
+        self.store.append_image_vectors({"c": np.full(2, 3.0)})
+
+        vectors = self.store.load_image_vectors(keys=["b", "c", "missing"])
+
+        self.assertEqual(set(vectors), {"b", "c"})
+
+    def test_load_mmap_matches_regular_load(self) -> None:
+        path = self.store.paths.vec_text_npz
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, a=np.arange(4, dtype=np.float16), b=np.ones(2, dtype=np.float16))
+        self.store.append_text_vectors({"b": np.zeros(2)})
+
+        vectors = self.store.load_text_vectors(mmap=True)
+
+        self.assertIsInstance(vectors["a"], np.memmap)
+        np.testing.assert_array_equal(vectors["a"], np.arange(4, dtype=np.float16))
+        np.testing.assert_array_equal(vectors["b"], np.zeros(2, dtype=np.float16))
+
+    def test_compacted_snapshot_is_stored_uncompressed(self) -> None:
+        self.store.append_text_vectors({"a": np.ones(8)})
+        self.store.compact_text_vectors()
+
+        with zipfile.ZipFile(self.store.paths.vec_text_npz) as zf:
+            self.assertEqual({i.compress_type for i in zf.infolist()}, {zipfile.ZIP_STORED})
+        self.assertIsInstance(self.store.load_text_vectors(mmap=True)["a"], np.memmap)
+
+    def test_compressed_save_round_trip(self) -> None:
+        path = self.store.paths.vec_image_npz
+        self.store._save_npz_map(path, {"a": np.arange(64)}, compress=True)
+
+        with zipfile.ZipFile(path) as zf:
+            self.assertEqual(zf.getinfo("a.npy").compress_type, zipfile.ZIP_DEFLATED)
+        np.testing.assert_array_equal(
+            self.store.load_image_vectors()["a"], np.arange(64, dtype=np.float16)
+        )
+
+    def test_compact_writes_stacked_snapshot(self) -> None:
+        self.store.append_text_vectors({"a": np.ones(3), "b": np.zeros(3)})
+        self.store.compact_text_vectors()
+        self.store.append_text_vectors({"c": np.full(3, 2.0)})
+
+        with zipfile.ZipFile(self.store.paths.vec_text_npz) as zf:
+            self.assertEqual(sorted(zf.namelist()), ["__data__.npy", "__ids__.npy"])
+        self.assertEqual(self.store.load_text_vector_keys(), {"a", "b", "c"})
+        vectors = self.store.load_text_vectors(keys=["b", "c"], mmap=True)
+        self.assertEqual(set(vectors), {"b", "c"})
+        np.testing.assert_array_equal(vectors["b"], np.zeros(3, dtype=np.float16))
+
+    def test_load_selected_keys_from_stacked_snapshot(self) -> None:
+        self.store.quantize_snapshots = True
+        self.store.append_image_vectors({"a": np.ones(4), "b": np.full(4, -2.0), "c": np.zeros(4)})
+        self.store.compact_image_vectors()
+
+        vectors = self.store.load_image_vectors(keys=["b"])
+
+        self.assertEqual(set(vectors), {"b"})
+        self.assertNotIsInstance(vectors["b"], np.memmap)
+        np.testing.assert_allclose(vectors["b"], np.full(4, -2.0), atol=0.05)
+
+    def test_quantized_snapshot_round_trip(self) -> None:
+        self.store.quantize_snapshots = True
+        rng = np.random.default_rng(0)
+        vecs = {f"k{i}": rng.standard_normal(16) for i in range(4)}
+        vecs["zero"] = np.zeros(16)
+        self.store.append_image_vectors(vecs)
+        self.store.compact_image_vectors()
+
+        with np.load(self.store.paths.vec_image_npz) as data:
+            self.assertEqual(data["__data__"].dtype, np.int8)
+        loaded = self.store.load_image_vectors()
+        for key, vec in vecs.items():
+            self.assertEqual(loaded[key].dtype, np.float16)
+            np.testing.assert_allclose(loaded[key], vec, atol=0.05)
+
+    def test_compact_mixed_dimensions_keeps_per_key_layout(self) -> None:
+        self.store.append_image_vectors({"a": np.ones(2), "b": np.ones(3)})
+        self.store.compact_image_vectors()
+
+        with zipfile.ZipFile(self.store.paths.vec_image_npz) as zf:
+            self.assertEqual(sorted(zf.namelist()), ["a.npy", "b.npy"])
+
+    def test_compact_without_delta_keeps_snapshot(self) -> None:
+        self.store.append_text_vectors({"a": np.ones(2)})
+        self.store.compact_text_vectors()
+        self.store.compact_text_vectors()
+
+        self.assertFalse(self.store.paths.vec_text_delta_npz.exists())
+        self.assertEqual(set(self.store.load_text_vectors()), {"a"})
+
+    def test_auto_compact_when_delta_exceeds_threshold(self) -> None:
+        self.store.delta_compact_bytes = 0
+        self.store.append_text_vectors({"a": np.ones(4)}, auto_compact=True)
+
+        self.assertFalse(self.store.paths.vec_text_delta_npz.exists())
+        self.assertEqual(set(self.store.load_text_vectors()), {"a"})
+
+        self.store.delta_compact_bytes = 1 << 30
+        self.store.append_text_vectors({"b": np.ones(4)}, auto_compact=True)
+
+        self.assertTrue(self.store.paths.vec_text_delta_npz.exists())
+
+    def test_append_adds_members_and_overwrites_existing_keys(self) -> None:
+        self.store.append_text_vectors({"a": np.ones(2)})
+        self.store.append_text_vectors({"b": np.zeros(2)})
+        self.store.append_text_vectors({"a": np.full(2, 5.0)})
+
+        with zipfile.ZipFile(self.store.paths.vec_text_delta_npz) as zf:
+            self.assertEqual(sorted(zf.namelist()), ["a.npy", "b.npy"])
+        vectors = self.store.load_text_vectors()
+        np.testing.assert_array_equal(vectors["a"], np.full(2, 5.0, dtype=np.float16))
+        np.testing.assert_array_equal(vectors["b"], np.zeros(2, dtype=np.float16))
+
+    def test_append_leaves_no_temp_file(self) -> None:
+        self.store.append_text_vectors({"a": np.ones(2)})
+        self.store.append_text_vectors({"b": np.zeros(2)})
+
+        delta = self.store.paths.vec_text_delta_npz
+        self.assertEqual([p.name for p in delta.parent.iterdir() if "tmp" in p.name], [])
+        self.assertEqual(self.store.load_text_vector_keys(), {"a", "b"})
+
+
+class TestProjectStoreAppState(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = ProjectStore(Path(self.temp_dir.name))
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_save_project_writes_each_file_once(self) -> None:
+        self.store.save_project({"project_name": "demo", "whitelist_dirs": []})
+        self.store.save_project({"project_name": "demo2", "whitelist_dirs": []})
+
+        self.assertEqual(self.store.load_project()["project_name"], "demo2")
+        self.assertEqual(self.store.load_app_state()["project_name"], "demo2")
+        self.assertEqual(list(self.store.root.glob("project.json.*.bak")), [])
+
+    def test_load_app_state_normalizes_legacy_entries(self) -> None:
+        self.store.save_app_state(
+            {"whitelist_dirs": [" C:/a ", "", {"path": "C:/b", "extra": 1}], "recent_queries": []}
+        )
+
+        state = self.store.load_app_state()
+
+        self.assertEqual(
+            state["whitelist_dirs"],
+            ["C:/a", {"path": "C:/b", "enabled": True, "recursive": True}],
+        )
+
+    def test_save_slide_pages_normalizes_values(self) -> None:
+        self.store.save_slide_pages({"p1": "text", "p2": None, 3: 4})  # type: ignore[dict-item]
+
+        self.assertEqual(self.store.load_slide_pages(), {"p1": "text", "p2": "", "3": "4"})
+
+    def test_scan_thumb_names_groups_by_file_id(self) -> None:
+        thumbs = self.store.paths.thumbs_dir
+        (thumbs / "f1").mkdir(parents=True)
+        (thumbs / "f1" / "1.png").write_bytes(b"png")
+        (thumbs / "f1" / "2.png").write_bytes(b"png")
+        (thumbs / "f2").mkdir()
+
+        self.assertEqual(self.store.scan_thumb_names(), {"f1": {"1.png", "2.png"}, "f2": set()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -36,6 +36,26 @@ class TestRateLimit(unittest.IsolatedAsyncioTestCase):
             await limiter.acquire(req_cost=1.0, tok_cost=1.0)
             await limiter.acquire(req_cost=1.0, tok_cost=1.0)
 
+    async def test_acquire_reserves_and_sleeps_once(self) -> None:
+        current = 0.0
+        delays: list[float] = []
+
+        def fake_monotonic() -> float:
+            return current
+
+        async def fake_sleep(delay: float) -> None:
+            delays.append(delay)
+
+        with patch("app.backend_daemon.rate_limit.time.monotonic", new=fake_monotonic), patch(
+            "app.backend_daemon.rate_limit.asyncio.sleep", new=fake_sleep
+        ):
+            limiter = DualTokenBucket(req_per_min=60, tok_per_min=6000)
+            await limiter.acquire(req_cost=60.0, tok_cost=1.0)
+            await limiter.acquire(req_cost=1.0, tok_cost=1.0)
+            await limiter.acquire(req_cost=1.0, tok_cost=1.0)
+
+        self.assertEqual(delays, [1.0, 2.0])
+
     def test_backoff_delay_has_jitter(self) -> None:
         delays = [backoff_delay(i) for i in range(4)]
         self.assertTrue(delays[1] > delays[0])
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from tests.helpers import ensure_src_path
+
+ROOT = ensure_src_path()
+
+from app.services.secrets_service import SecretsService
+
+
+class TestSecretsService(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.home = Path(self.temp_dir.name)
+        with patch(
+            "app.services.secrets_service.secrets_path", return_value=self.home / "secrets.json"
+        ), patch("app.services.secrets_service.app_home_dir", return_value=self.home):
+            self.service = SecretsService()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_api_key_round_trip_reuses_fernet(self) -> None:
+        self.service.set_openai_api_key("sk-test")
+        fernet = self.service._get_fernet()
+
+        self.assertEqual(self.service.get_openai_api_key(), "sk-test")
+        self.assertIs(self.service._get_fernet(), fernet)
+
+    def test_load_returns_copy(self) -> None:
+        self.service.set_openai_api_key("sk-test")
+        loaded = self.service.load()
+        loaded.openai_api_key_enc = None
+
+        self.assertIsNotNone(self.service.load().openai_api_key_enc)
+
+    def test_save_skips_unchanged_secrets(self) -> None:
+        self.service.set_openai_api_key("sk-test")
+        secrets = self.service.load()
+
+        with patch("app.services.secrets_service.atomic_write_json") as writer:
+            self.service.save(secrets)
+            writer.assert_not_called()
+        self.assertEqual(list(self.home.glob("secrets.json.*")), [])
+
+    def test_setting_same_key_keeps_token(self) -> None:
+        self.service.set_openai_api_key("sk-test")
+        token = self.service.load().openai_api_key_enc
+
+        self.service.set_openai_api_key(" sk-test ")
+
+        self.assertEqual(self.service.load().openai_api_key_enc, token)
+
+    def test_no_key_file_without_api_key(self) -> None:
+        self.assertIsNone(self.service.get_openai_api_key())
+        self.service.set_openai_api_key("")
+
+        self.assertFalse((self.home / "secrets.key").exists())
+
+    def test_clear_api_key(self) -> None:
+        self.service.set_openai_api_key("sk-test")
+        self.service.set_openai_api_key("")
+
+        self.assertIsNone(self.service.get_openai_api_key())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,7 +11,7 @@ from tests.helpers import build_pdf, ensure_src_path
 
 ROOT = ensure_src_path()
 
-from app.backend_daemon.thumb_render import render_pdf_page_to_thumb, thumb_size
+from app.backend_daemon.thumb_render import open_pdf, render_pdf_page_to_thumb, thumb_size
 
 
 class TestThumbRender(unittest.TestCase):
@@ -32,6 +32,33 @@ class TestThumbRender(unittest.TestCase):
             with Image.open(out_img) as img:
                 self.assertEqual(img.size, (320, 240))
 
+    def test_render_pages_with_shared_doc(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            pdf_path = Path(td) / "demo.pdf"
+            build_pdf(pdf_path, pages=2, width=400, height=300)
+            doc = open_pdf(pdf_path)
+            try:
+                for idx in range(2):
+                    out_img = Path(td) / f"thumb_{idx}.jpg"
+                    render_pdf_page_to_thumb(pdf_path, idx, out_img, 320, 240, doc)
+                    with Image.open(out_img) as img:
+                        self.assertEqual(img.size, (320, 240))
+            finally:
+                if doc is not None:
+                    doc.close()
+
+    def test_render_pdf_page_to_webp(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            pdf_path = Path(td) / "demo.pdf"
+            build_pdf(pdf_path, pages=1, width=400, height=300)
+            out_img = Path(td) / "thumb.webp"
+
+            render_pdf_page_to_thumb(pdf_path, 0, out_img, 320, 240)
+
+            with Image.open(out_img) as img:
+                self.assertEqual(img.format, "WEBP")
+                self.assertEqual(img.size, (320, 240))
+
 
 if __name__ == "__main__":
     unittest.main()